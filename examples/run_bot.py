@@ -1,5 +1,8 @@
 import json
 from argparse import ArgumentParser
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pprint import pprint
 from typing import cast
 
@@ -16,7 +19,8 @@ def run_game(
     game_id: str = "1",
     time_limit: int = 2000,
     terminal: bool = False,
-):
+) -> str:
+    """Play one game of the MCTS bot against random and return its result."""
     # Load configurations, rules, arena and teams
     config = botbowl.load_config("bot-bowl")
     config.competition_mode = False
@@ -62,9 +66,26 @@ def run_game(
         with open("error.json", "w") as f:
             json.dump(game.to_json(), f, indent=4)
         raise
-    print(
-        f"Game ended with result: Home {game.state.home_team.state.score} - "
-        f"Away {game.state.away_team.state.score}"
+    home_score = game.state.home_team.state.score
+    away_score = game.state.away_team.state.score
+    print(f"Game {game_id} ended with result: Home {home_score} - Away {away_score}")
+    mcts_score, opp_score = (
+        (home_score, away_score) if as_home else (away_score, home_score)
+    )
+    if mcts_score > opp_score:
+        return "win"
+    if mcts_score < opp_score:
+        return "loss"
+    return "draw"
+
+
+def run_numbered_game(i: int, time_limit: int, terminal: bool) -> str:
+    """Play game `i`, alternating the MCTS bot between home and away."""
+    return run_game(
+        game_id=str(i),
+        as_home=(i % 2 == 0),
+        time_limit=time_limit,
+        terminal=terminal,
     )
 
 
@@ -89,11 +110,26 @@ if __name__ == "__main__":
         action="store_true",
         help="Enable terminal node selection for MCTS bot",
     )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of processes playing games in parallel",
+    )
     args = parser.parse_args()
-    for i in range(args.num_games):
-        run_game(
-            game_id=str(i),
-            as_home=(i % 2 == 0),
-            time_limit=args.time_limit,
-            terminal=args.terminal,
-        )
+    play = partial(
+        run_numbered_game, time_limit=args.time_limit, terminal=args.terminal
+    )
+    games = range(args.num_games)
+    if args.workers > 1:
+        # Games are independent and each worker loads its own setup, so only the
+        # game number and the result cross the process boundary
+        with ProcessPoolExecutor(args.workers) as executor:
+            results = Counter(executor.map(play, games))
+    else:
+        results = Counter(map(play, games))
+    print(
+        f"MCTS results: {results['win']} wins, {results['draw']} draws, "
+        f"{results['loss']} losses"
+    )
@@ -17,7 +17,14 @@
 import configparser
 import json
 import logging
+import os
+import queue
+import threading
+from collections import deque
+from functools import lru_cache
+from operator import attrgetter
 from pathlib import Path
+from types import SimpleNamespace
 
 import botbowl
 import jnius_config
@@ -35,81 +42,204 @@ from botbowl import (
 )
 from yasa.components.serializer import GameStateSerializer
 
-config = configparser.ConfigParser()
-result = config.read(Path(__file__).with_suffix(".cfg"))
-if not result:
-    raise FileNotFoundError("Missing config file for drefsante")
+log_dir = Path() / "logs"
 
-jar_path = Path(__file__).parent / config["setup"]["jarPathName"]
-if jar_path.exists():
-    jnius_config.set_classpath(str(jar_path))
-else:
-    raise (FileNotFoundError(f"Missing jar file for drefsante at {jar_path}"))
+logger = logging.getLogger("drefsante")
 
-from jnius import JavaClass, JavaMethod, MetaJavaClass, autoclass  # noqa: E402, I001
+# Names of the weather in the Java model
+WEATHER_NAMES = {
+    WeatherType.SWELTERING_HEAT: "HEAT",
+    WeatherType.VERY_SUNNY: "SUNNY",
+    WeatherType.NICE: "GOOD",
+    WeatherType.POURING_RAIN: "RAIN",
+    WeatherType.BLIZZARD: "BLIZZARD",
+}
+
+# Block die selected by each block dice action
+DICE_SELECTIONS = {
+    ActionType.SELECT_ATTACKER_DOWN: BBDieResult.ATTACKER_DOWN.value,
+    ActionType.SELECT_BOTH_DOWN: BBDieResult.BOTH_DOWN.value,
+    ActionType.SELECT_PUSH: BBDieResult.PUSH.value,
+    ActionType.SELECT_DEFENDER_STUMBLES: BBDieResult.DEFENDER_STUMBLES.value,
+    ActionType.SELECT_DEFENDER_DOWN: BBDieResult.DEFENDER_DOWN.value,
+}
+
+# Player fields sent to Java, fetched in one C-level call each; order is the Java layout
+ROLE_FIELDS = attrgetter("name", "cost", "ma", "st", "ag", "av")
+STATE_FLAGS = attrgetter(
+    "used",
+    "hypnotized",
+    "bone_headed",
+    "really_stupid",
+    "taken_root",
+    "wild_animal",
+    "has_blocked",
+    "stunned",
+)
 
-TEMPORARY_FOLDER = Path(__file__).parent / config["setup"]["temporaryFolder"]
-TEMPORARY_FOLDER.mkdir(parents=True, exist_ok=True)
+NULL_SQUARE = Square(-1, -1)
 
-log_dir = Path() / "logs"
-log_dir.mkdir(exist_ok=True)
 
-logger = logging.getLogger("drefsante")
+# Squares of the 15x26 Java board by square id (row i, column j -> i * 26 + j), and
+# the reverse lookup, so conversions are a single index instead of arithmetic
+SQUARES = tuple(Square(j + 1, i + 1) for i in range(15) for j in range(26))
+SQUARE_IDS = {(square.x, square.y): squareId for squareId, square in enumerate(SQUARES)}
 
 
-class FFAIProxy(JavaClass, metaclass=MetaJavaClass):
-    # Note: in case of error at next line, check the jarPathName in drefsante_bot.cfg. The jar must exist.
-    __javaclass__ = "be/drefsante/bloodbowl/presenter/FFAIProxy"
-    __metaclass__ = MetaJavaClass
+def planPlayerAction(actionType):
+    """
+    Builder of a planned action only targeting the player.
+    """
 
-    # Signature obtained using command:
-    # javap -s C:\Users\drefs\git\bloodbowl-ai\target\classes\be\drefsante\bloodbowl\presenter\FFAIProxy.class
+    def build(bot, game, squareId, playerName):
+        return Action(actionType, player=bot.getUnitFromName(game, playerName))
 
-    updateModel = JavaMethod(
-        "(IZIZZLjava/lang/String;Ljava/lang/String;ZLjava/lang/String;)V"
-    )
-    setup = JavaMethod("(ZZ)Ljava/lang/String;")
-    playTurn = JavaMethod("(Ljava/lang/String;)Ljava/lang/String;")
-    selectPlayerToGetBall = JavaMethod("()Ljava/lang/String;")
-    askWhichDice = JavaMethod(
-        "(Ljava/util/List;Ljava/lang/String;Ljava/lang/String;Z)I"
-    )
-    askOnWhichSquarePushed = JavaMethod(
-        "(Ljava/lang/String;Ljava/lang/String;Ljava/util/List;Z)I"
-    )
-    askToFollow = JavaMethod("(Ljava/lang/String;ILjava/lang/String;)Z")
-    askUseApothecary = JavaMethod("(Ljava/lang/String;II)Z")
-    askPlayerToIntercept = JavaMethod("(Ljava/lang/String;Ljava/util/List;)I")
-    selectPlayerForHighKick = JavaMethod("()Ljava/lang/String;")
-    selectBallDestinationSquare = JavaMethod("()I")
-    askRerollForBlock = JavaMethod(
-        "(Ljava/util/List;Ljava/lang/String;Ljava/lang/String;Z)Z"
-    )
-    askForReroll = JavaMethod("(Ljava/lang/String;)Z")
-    askIfPlayerUsesJuggernautSkill = JavaMethod(
-        "(Ljava/lang/String;Ljava/lang/String;)Z"
-    )
-    askIfPlayerUsesWrestleSkill = JavaMethod("(Ljava/lang/String;Ljava/lang/String;)Z")
-    askIfPlayerUsesShadowing = JavaMethod("(Ljava/lang/String;Ljava/lang/String;)Z")
-    askIfPlayerUsesStandFirmSkill = JavaMethod(
-        "(Ljava/lang/String;Ljava/lang/String;)Z"
+    return build
+
+
+def planSquareAction(actionType):
+    """
+    Builder of a planned action of the player towards a square.
+    """
+
+    def build(bot, game, squareId, playerName):
+        position = bot.getPosition(squareId)
+        mover = bot.getUnitFromName(game, playerName)
+        return Action(actionType, position, mover)
+
+    return build
+
+
+def planStandUp(bot, game, squareId, playerName):
+    mover = bot.getUnitFromName(game, playerName)
+    if mover.state.up:
+        logger.debug("Try to rise up player not prone")
+    return Action(ActionType.STAND_UP, player=mover)
+
+
+def planPickupTeamMate(bot, game, squareId, playerName):
+    mover = bot.getUnitFromName(game, playerName)
+    return Action(ActionType.PICKUP_TEAM_MATE, mover)  # TODO check
+
+
+def planEndTurn(bot, game, squareId, playerName):
+    return Action(ActionType.END_TURN)
+
+
+# Builder of each action of a Java plan, keyed by the plan action key
+PLAN_BUILDERS = {
+    "START_MOVE": planPlayerAction(ActionType.START_MOVE),
+    "START_BLITZ": planPlayerAction(ActionType.START_BLITZ),
+    "START_BLOCK": planPlayerAction(ActionType.START_BLOCK),
+    "START_PASS": planPlayerAction(ActionType.START_PASS),
+    "START_HANDOFF": planPlayerAction(ActionType.START_HANDOFF),
+    "START_FOUL": planPlayerAction(ActionType.START_FOUL),
+    "MOVE": planSquareAction(ActionType.MOVE),
+    "END_PLAYER_TURN": planPlayerAction(ActionType.END_PLAYER_TURN),
+    "STAND_UP": planStandUp,
+    "BLOCK": planSquareAction(ActionType.BLOCK),
+    "PASS": planSquareAction(ActionType.PASS),
+    "HANDOFF": planSquareAction(ActionType.HANDOFF),
+    "PICKUP_TEAM_MATE": planPickupTeamMate,
+    "THROW_TEAM_MATE": planSquareAction(ActionType.THROW_TEAM_MATE),  # TODO check
+    "LEAP": planSquareAction(ActionType.LEAP),  # TODO check
+    "END_TURN": planEndTurn,
+    "FOUL": planSquareAction(ActionType.FOUL),
+}
+
+
+@lru_cache(maxsize=None)
+def loadJava():
+    """
+    Read the drefsante config, start the JVM on the bot jar and bind the Java classes.
+    Done on the first bot instead of at import, and only once since the JVM classpath
+    cannot change after it started.
+    """
+    config = configparser.ConfigParser()
+    result = config.read(Path(__file__).with_suffix(".cfg"))
+    if not result:
+        raise FileNotFoundError("Missing config file for drefsante")
+
+    jar_path = Path(__file__).parent / config["setup"]["jarPathName"]
+    if jar_path.exists():
+        jnius_config.set_classpath(str(jar_path))
+    else:
+        raise (FileNotFoundError(f"Missing jar file for drefsante at {jar_path}"))
+
+    from jnius import JavaClass, JavaMethod, MetaJavaClass, autoclass
+
+    class FFAIProxy(JavaClass, metaclass=MetaJavaClass):
+        # Note: in case of error at next line, check the jarPathName in drefsante_bot.cfg. The jar must exist.
+        __javaclass__ = "be/drefsante/bloodbowl/presenter/FFAIProxy"
+        __metaclass__ = MetaJavaClass
+
+        # Signature obtained using command:
+        # javap -s C:\Users\drefs\git\bloodbowl-ai\target\classes\be\drefsante\bloodbowl\presenter\FFAIProxy.class
+
+        updateModel = JavaMethod(
+            "(IZIZZLjava/lang/String;Ljava/lang/String;ZLjava/lang/String;)V"
+        )
+        setup = JavaMethod("(ZZ)Ljava/lang/String;")
+        playTurn = JavaMethod("(Ljava/lang/String;)Ljava/lang/String;")
+        selectPlayerToGetBall = JavaMethod("()Ljava/lang/String;")
+        askWhichDice = JavaMethod(
+            "(Ljava/util/List;Ljava/lang/String;Ljava/lang/String;Z)I"
+        )
+        askOnWhichSquarePushed = JavaMethod(
+            "(Ljava/lang/String;Ljava/lang/String;Ljava/util/List;Z)I"
+        )
+        askToFollow = JavaMethod("(Ljava/lang/String;ILjava/lang/String;)Z")
+        askUseApothecary = JavaMethod("(Ljava/lang/String;II)Z")
+        askPlayerToIntercept = JavaMethod("(Ljava/lang/String;Ljava/util/List;)I")
+        selectPlayerForHighKick = JavaMethod("()Ljava/lang/String;")
+        selectBallDestinationSquare = JavaMethod("()I")
+        askRerollForBlock = JavaMethod(
+            "(Ljava/util/List;Ljava/lang/String;Ljava/lang/String;Z)Z"
+        )
+        askForReroll = JavaMethod("(Ljava/lang/String;)Z")
+        askIfPlayerUsesJuggernautSkill = JavaMethod(
+            "(Ljava/lang/String;Ljava/lang/String;)Z"
+        )
+        askIfPlayerUsesWrestleSkill = JavaMethod(
+            "(Ljava/lang/String;Ljava/lang/String;)Z"
+        )
+        askIfPlayerUsesShadowing = JavaMethod("(Ljava/lang/String;Ljava/lang/String;)Z")
+        askIfPlayerUsesStandFirmSkill = JavaMethod(
+            "(Ljava/lang/String;Ljava/lang/String;)Z"
+        )
+        askIfPlayerUsesProSkill = JavaMethod("(Ljava/lang/String;)Z")
+        askIfPlayerUsesBribe = JavaMethod("(Ljava/lang/String;)Z")
+        endGame = JavaMethod("()V")
+
+    temporaryFolder = Path(__file__).parent / config["setup"]["temporaryFolder"]
+    temporaryFolder.mkdir(parents=True, exist_ok=True)
+    log_dir.mkdir(exist_ok=True)
+
+    # autoclass reflects over every method of the class, so it is resolved only once
+    return SimpleNamespace(
+        FFAIProxy=FFAIProxy,
+        ArrayList=autoclass("java.util.ArrayList"),
+        Arrays=autoclass("java.util.Arrays"),
+        temporaryFolder=temporaryFolder,
     )
-    askIfPlayerUsesProSkill = JavaMethod("(Ljava/lang/String;)Z")
-    askIfPlayerUsesBribe = JavaMethod("(Ljava/lang/String;)Z")
-    endGame = JavaMethod("()V")
 
 
 class DrefsanteBot(ProcBot):
     def __init__(self, name):
         super().__init__(name)
+        self.java = loadJava()
         self.my_team = None
         self.opp_team = None
-        self.actions = []
+        self.actions = deque()
         self.last_turn = 0
         self.last_half = 0
-        self.setup_actions = []
+        self.setup_actions = deque()
         self.ffaiProxy = None
         self.oldDefensorPosition = -1
+        self.nameIndex = {}
+        self.availableActions = None
+        self.availableActionTypes = set()
+        self.modelUpdated = False
         self.name = name
 
         # !!! !!!
@@ -163,17 +293,50 @@ class DrefsanteBot(ProcBot):
         self.last_turn = 0
         self.last_half = 0
 
-        FFAIProxy = autoclass("be.drefsante.bloodbowl.presenter.FFAIProxy")
-        self.ffaiProxy = FFAIProxy()
+        # FFAIProxy is declared once per process with explicit signatures, so no
+        # reflection happens per game. Its methods are deliberately not cached on self:
+        # pyjnius rebinds a JavaMethod to the last instance it was fetched from, which
+        # would break when two drefsante bots play each other.
+        self.ffaiProxy = self.java.FFAIProxy()
+
+        self.temporaryFolder = self.java.temporaryFolder
+
+        # The folder used to hand the teams over to Java only depends on the game and
+        # team, so it is created once here instead of on every updateModel call. It is
+        # per team so that a bot can trust the team files it last wrote (see writeTeam)
+        # even when two drefsante bots play each other.
+        self.gameFolder = self.temporaryFolder / str(game.game_id) / str(team.team_id)
+        self.gameFolder.mkdir(parents=True, exist_ok=True)
+        self.gameFolderPrefix = str(self.gameFolder) + "/"
+        self.writtenTeams = {}
+        self.teamFiles = {}
+        self.roleSkillValues = {}
+
+        # Game states are written to the log by a background thread, so encoding and
+        # file I/O stay off the decision path
+        self.logQueue = queue.Queue()
+        self.logWriter = threading.Thread(
+            target=self.writeLogs,
+            args=(log_dir / f"game_{game.game_id}.jsonl", self.logQueue),
+            daemon=True,
+        )
+        self.logWriter.start()
 
-        self.temporaryFolder = TEMPORARY_FOLDER
+    def writeLogs(self, logFile, logQueue):
+        """
+        Append the queued game states to the log file until None is queued.
+        """
+        # Line buffered so each record is appended in a single write
+        with open(logFile, "a", buffering=1) as f:
+            while (game_state_json := logQueue.get()) is not None:
+                f.write(json.dumps(game_state_json) + "\n")
 
     def act(self, game: Game) -> Action:
-        log_file = log_dir / f"game_{game.game_id}.jsonl"
-        game_state_json = GameStateSerializer.to_json(game.state)
-        with open(log_file, "a") as f:
-            json.dump(game_state_json, f)
-            f.write("\n")
+        # The state is snapshotted here since the game keeps changing after act returns
+        self.logQueue.put(GameStateSerializer.to_json(game.state))
+        # The game cannot change while we decide, so the Java model is written at
+        # most once per act whatever the decision methods call
+        self.modelUpdated = False
 
         return super().act(game)
 
@@ -187,6 +350,7 @@ class DrefsanteBot(ProcBot):
         # ArrayList = autoclass('java.util.ArrayList')
         team = []  # ArrayList()
 
+        self.teamGroups = self.getTeamGroups(game, teamFFAI)
         self.convertedListOfPlayers(game, teamFFAI.players, team)
         team.append(teamFFAI.race)
 
@@ -217,9 +381,21 @@ class DrefsanteBot(ProcBot):
 
         return team
 
+    def getTeamGroups(self, game, teamFFAI):
+        """
+        Ids of the team players on the pitch, in reserves, knocked out and in the dungeon.
+        Fetched once per team instead of once per player, with O(1) membership.
+        """
+        return (
+            {unit.player_id for unit in game.get_players_on_pitch(teamFFAI)},
+            {unit.player_id for unit in game.get_reserves(teamFFAI)},
+            {unit.player_id for unit in game.get_knocked_out(teamFFAI)},
+            {unit.player_id for unit in game.get_dungeon(teamFFAI)},
+        )
+
     def getProxyPosition(self, position):
         if position is None:
-            return Square(-1, -1)
+            return NULL_SQUARE
         return position
 
     def convertedListOfPlayers(self, game, units, players):
@@ -231,15 +407,13 @@ class DrefsanteBot(ProcBot):
             players.append(0)
             return players
 
-        tempArray = []  # ArrayList()
-
-        for unit in units:
-            self.convertPlayer(game, unit, tempArray)
-
-        players.append(len(tempArray) + 1)  # num of elements
+        # Players are written in place; the element count is patched once they are known
+        start = len(players)
+        players.append(0)  # num of elements
         players.append(len(units))  # num of players
-        for value in tempArray:
-            players.append(value)
+        for unit in units:
+            self.convertPlayer(game, unit, players)
+        players[start] = len(players) - start - 1
 
         return players
 
@@ -252,72 +426,57 @@ class DrefsanteBot(ProcBot):
             player.append(0)
             return player
 
-        tempArray = []  # ArrayList()
+        # Fields are written in place; the field count is patched once they are known
+        start = len(player)
+        player.append(0)
+        onPitch, reserves, knockedOut, dungeon = self.teamGroups
 
-        tempArray.append(self.getName(game, unit))
-        tempArray.append(unit.role.name)
-        tempArray.append(unit.role.cost)
-        tempArray.append(unit.role.ma)
-        tempArray.append(unit.role.st)
-        tempArray.append(unit.role.ag)
-        tempArray.append(unit.role.av)
-        tempArray.append(unit in game.get_players_on_pitch(unit.team))
+        player.append(self.getName(game, unit))
+        player.extend(ROLE_FIELDS(unit.role))
+        player.append(unit.player_id in onPitch)
 
-        tempArray.append(self.getSquareId(unit.position))
+        player.append(self.getSquareId(unit.position))
 
-        tempArray.append(unit in game.get_reserves(unit.team))
-        tempArray.append(unit in game.get_knocked_out(unit.team))
+        player.append(unit.player_id in reserves)
+        player.append(unit.player_id in knockedOut)
 
         isDead = CasualtyEffect.DEAD in unit.state.injuries_gained
 
-        tempArray.append(isDead)
-        tempArray.append(not isDead and len(unit.state.injuries_gained) > 0)  # injuried
+        player.append(isDead)
+        player.append(not isDead and len(unit.state.injuries_gained) > 0)  # injuried
 
-        tempArray.append(
-            unit in game.get_dungeon(unit.team)
-        )  # TODO to check # excluded
+        player.append(unit.player_id in dungeon)  # TODO to check # excluded
 
         hasActionType = (
-            unit == game.get_active_player()
-            and game.get_player_action_type() is not None
+            unit == self.activePlayer and self.activePlayerActionType is not None
         )
-        tempArray.append(hasActionType)
+        player.append(hasActionType)
 
         if hasActionType:
-            tempArray.append(game.get_player_action_type().value)
+            player.append(self.activePlayerActionType.value)
         else:
-            tempArray.append(None)
-
-        tempArray.append(unit.state.used)
+            player.append(None)
 
-        tempArray.append(unit.state.hypnotized)
-        tempArray.append(unit.state.bone_headed)
-        tempArray.append(unit.state.really_stupid)
-        tempArray.append(unit.state.taken_root)
-        tempArray.append(unit.state.wild_animal)  # todo check
-        tempArray.append(unit.state.has_blocked)
-        tempArray.append(unit.state.stunned)
-        tempArray.append(len(unit.state.injuries_gained) > 0)
-        tempArray.append(unit.state.knocked_out)
+        player.extend(STATE_FLAGS(unit.state))  # todo check wild_animal
+        player.append(len(unit.state.injuries_gained) > 0)
+        player.append(unit.state.knocked_out)
 
-        tempArray.append(unit.state.heated)
-        tempArray.append(not unit.state.up)
+        player.append(unit.state.heated)
+        player.append(not unit.state.up)
 
         if (
             not unit.state.up
-            and game.get_ball_position() is not None
-            and game.get_ball_position() == unit.position
+            and self.ballPosition is not None
+            and self.ballPosition == unit.position
         ):
             logger.debug("Knocked out player has the ball!!!")
 
-        tempArray.append(unit.num_moves_left(include_gfi=True))
-        tempArray.append(unit.num_moves_left(include_gfi=False))
-        # tempArray.append(unit.player_id)
-        self.convertSkills(unit, tempArray)
+        player.append(unit.num_moves_left(include_gfi=True))
+        player.append(unit.num_moves_left(include_gfi=False))
+        # player.append(unit.player_id)
+        self.convertSkills(unit, player)
 
-        player.append(len(tempArray))
-        for value in tempArray:
-            player.append(value)
+        player[start] = len(player) - start - 1
 
         return player
         # return ListConverter().convert(player, self.gateway._gateway_client)
@@ -328,35 +487,58 @@ class DrefsanteBot(ProcBot):
             skills.append(0)
             return skills
 
-        tempArray = []  # ArrayList()
-
-        for skill in unit.role.skills:
-            tempArray.append(skill.value)
-
-        skills.append(len(tempArray))
-        for value in tempArray:
-            skills.append(value)
+        values = self.getSkillValues(unit.role)
+        skills.append(len(values))
+        skills.extend(values)
 
         return skills
 
+    def getSkillValues(self, role):
+        """
+        Skill enum values of a role, resolved once per role for the whole game
+        """
+        # Keyed by identity and holding the role so that its id cannot be reused
+        cached = self.roleSkillValues.get(id(role))
+        if cached is None:
+            cached = (role, [skill.value for skill in role.skills])
+            self.roleSkillValues[id(role)] = cached
+        return cached[1]
+
     def writeTeam(self, fileName, team):
-        with open(fileName, "w+") as f:
-            team = map(lambda x: str(x) + "\n", team)
-            f.writelines(team)
+        # One join and one unbuffered write instead of a text file writing line by line
+        data = ("\n".join(map(str, team)) + "\n").encode()
+        # Most model updates leave a team untouched; Java then reads the file as it is
+        if self.writtenTeams.get(fileName) == data:
+            return
+        self.writtenTeams[fileName] = data
 
-    def updateModel(self, game):
-        filePrefixWithPath = self.temporaryFolder / str(game.game_id)
-        filePrefixWithPath.mkdir(parents=True, exist_ok=True)
+        # The team files stay open for the whole game and are overwritten in place
+        fd = self.teamFiles.get(fileName)
+        if fd is None:
+            fd = os.open(fileName, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            self.teamFiles[fileName] = fd
+        os.lseek(fd, 0, os.SEEK_SET)
+        os.write(fd, data)
+        os.ftruncate(fd, len(data))
 
+    def updateModel(self, game):
         # Using file to update data to Java seems faster than to use pyjnius
         # However updating full model is really slow, and it should be improved to
         # update only player status, position, ball, etc...
         # Currently, this is the CPU bottleneck
+        if self.modelUpdated:
+            return
+        self.modelUpdated = True
+        self.rebuildNameIndex(game)
+        # Resolved once per model update rather than once per converted player
+        self.activePlayer = game.get_active_player()
+        self.activePlayerActionType = game.get_player_action_type()
+        self.ballPosition = game.get_ball_position()
         self.writeTeam(
-            filePrefixWithPath / "team1", self.convertTeam(game, self.my_team)
+            self.gameFolder / "team1", self.convertTeam(game, self.my_team)
         )
         self.writeTeam(
-            filePrefixWithPath / "team2", self.convertTeam(game, self.opp_team)
+            self.gameFolder / "team2", self.convertTeam(game, self.opp_team)
         )
 
         # Boolean = autoclass('java.lang.Boolean')
@@ -367,17 +549,17 @@ class DrefsanteBot(ProcBot):
         if game.is_quick_snap():
             isQuickSnap = game.is_quick_snap()
 
-        isActivePlayerHasAction = game.get_player_action_type() is not None
+        isActivePlayerHasAction = self.activePlayerActionType is not None
         isBallInAir = False
         # isBlitz = Boolean(False)
         if (
-            game.get_ball_position() is not None
-            and game.get_ball_at(game.get_ball_position()) is None
+            self.ballPosition is not None
+            and game.get_ball_at(self.ballPosition) is None
         ):
             isBallInAir = True
 
         self.ffaiProxy.updateModel(
-            self.getSquareId(game.get_ball_position()),
+            self.getSquareId(self.ballPosition),
             isBallInAir,
             game.state.half,
             isBlitz,
@@ -387,36 +569,27 @@ class DrefsanteBot(ProcBot):
             # self.convertTeam(game, self.opp_team), \
             self.getName(game, game.get_ball_carrier()),
             isActivePlayerHasAction,
-            str(filePrefixWithPath) + "/",
+            self.gameFolderPrefix,
         )  # , \
         # isBlitz) # TODO change to isBlitz action ???
 
         return
 
     def convertWeather(self, weather):
-        if weather == WeatherType.SWELTERING_HEAT:
-            return "HEAT"
-        if weather == WeatherType.VERY_SUNNY:
-            return "SUNNY"
-        if weather == WeatherType.NICE:
-            return "GOOD"
-        if weather == WeatherType.POURING_RAIN:
-            return "RAIN"
-        if weather == WeatherType.BLIZZARD:
-            return "BLIZZARD"
+        return WEATHER_NAMES.get(weather)
 
-        return None
+    def rebuildNameIndex(self, game):
+        """
+        Index both teams' players by the name given to Java, so each name returned by
+        Java is resolved in O(1) instead of scanning every player
+        """
+        self.nameIndex = {
+            self.getName(game, unit): unit
+            for unit in (*self.my_team.players, *self.opp_team.players)
+        }
 
     def getUnitFromName(self, game, name):
-        for unit in self.my_team.players:
-            if self.getName(game, unit) == name:
-                return unit
-
-        for unit in self.opp_team.players:
-            if self.getName(game, unit) == name:
-                return unit
-
-        return None
+        return self.nameIndex.get(name)
 
     def getName(self, game, unit):
         if unit is None:
@@ -432,7 +605,7 @@ class DrefsanteBot(ProcBot):
         self.opp_team = game.get_opp_team(self.my_team)
 
         if self.setup_actions:
-            action = self.setup_actions.pop(0)
+            action = self.setup_actions.popleft()
             logger.debug(
                 "Executing action ", action.action_type, "; Player = ", action.player
             )
@@ -473,7 +646,7 @@ class DrefsanteBot(ProcBot):
             )
 
         self.setup_actions.append(Action(ActionType.END_SETUP))
-        action = self.setup_actions.pop(0)
+        action = self.setup_actions.popleft()
         return action
 
     def setupIfHeatedDetected(self, game):
@@ -481,37 +654,28 @@ class DrefsanteBot(ProcBot):
         Set up if one player has status heated
         """
         if game.get_receiving_team() == self.my_team:
-            self.setup_actions = self.off_formation.actions(game, self.my_team)
+            self.setup_actions = deque(self.off_formation.actions(game, self.my_team))
             self.setup_actions.append(Action(ActionType.END_SETUP))
         else:
-            self.setup_actions = self.def_formation.actions(game, self.my_team)
+            self.setup_actions = deque(self.def_formation.actions(game, self.my_team))
             self.setup_actions.append(Action(ActionType.END_SETUP))
-        action = self.setup_actions.pop(0)
+        action = self.setup_actions.popleft()
         return action
 
+    def toJavaList(self, values):
+        """
+        Hand a Python list over to Java as a java.util.List.
+        The values cross JNI in a single varargs call instead of one add() call each.
+        """
+        return self.java.ArrayList(self.java.Arrays.asList(*values))
+
     def getBBDices(self, dicesFFAI):
-        ArrayList = autoclass("java.util.ArrayList")
-        dices = ArrayList()
-        for dice in dicesFFAI:
-            dices.add(dice.get_value().value)
-        return dices
+        return self.toJavaList([dice.get_value().value for dice in dicesFFAI])
 
     def getDices(self, actions):
-        ArrayList = autoclass("java.util.ArrayList")
-        dices = ArrayList()
-        for action in actions:
-            if action == ActionType.SELECT_ATTACKER_DOWN:
-                dices.add(BBDieResult.ATTACKER_DOWN.value)
-            elif action == ActionType.SELECT_BOTH_DOWN:
-                dices.add(BBDieResult.BOTH_DOWN.value)
-            elif action == ActionType.SELECT_PUSH:
-                dices.add(BBDieResult.PUSH.value)
-            elif action == ActionType.SELECT_DEFENDER_STUMBLES:
-                dices.add(BBDieResult.DEFENDER_STUMBLES.value)
-            elif action == ActionType.SELECT_DEFENDER_DOWN:
-                dices.add(BBDieResult.DEFENDER_DOWN.value)
-
-        return dices
+        return self.toJavaList(
+            [DICE_SELECTIONS[a] for a in actions if a in DICE_SELECTIONS]
+        )
 
     def reroll(self, game):
         self.updateModel(game)
@@ -608,12 +772,11 @@ class DrefsanteBot(ProcBot):
             self.actions.clear()
             self.last_turn = turn
             self.last_half = half
-            self.actions = []
 
         # End turn if only action left
         if len(game.state.available_actions) == 1:
             if game.state.available_actions[0].action_type == ActionType.END_TURN:
-                self.actions = [Action(ActionType.END_TURN)]
+                self.actions = deque([Action(ActionType.END_TURN)])
 
         # Execute planned actions if any
         if len(self.actions) > 0:
@@ -647,16 +810,23 @@ class DrefsanteBot(ProcBot):
         # return self.actions.append(Action(ActionType.END_PLAYER_TURN, player=game.get_active_player()))
 
     def _get_next_action(self):
-        action = self.actions[0]
-        self.actions = self.actions[1:]
+        return self.actions.popleft()
 
-        return action
+    def getAvailableActionTypes(self, game):
+        """
+        Action types currently available. botbowl replaces the available actions list
+        after each step, so the set is rebuilt only when that list changes.
+        """
+        availableActions = game.get_available_actions()
+        if availableActions is not self.availableActions:
+            self.availableActions = availableActions
+            self.availableActionTypes = {
+                action.action_type for action in availableActions
+            }
+        return self.availableActionTypes
 
     def isOptionAvailable(self, game, actionType):
-        for action in game.get_available_actions():
-            if action.action_type == actionType:
-                return True
-        return False
+        return actionType in self.getAvailableActionTypes(game)
 
     def isStartOptionAvailable(self, game):
         return self.isOptionAvailable(game, ActionType.START_MOVE)
@@ -671,6 +841,22 @@ class DrefsanteBot(ProcBot):
             return self.getName(game, game.get_active_player())
         return ""
 
+    def decodePlan(self, actionAI):
+        """
+        Decode the plan returned by Java into (actionKey, squareId, playerName) records.
+        Lines are either "KEY", "KEY;playerName" or "KEY;squareId;playerName".
+        """
+        for line in actionAI.split("\n"):
+            if not line:
+                continue
+            keys = line.split(";")
+            if len(keys) > 2:
+                yield keys[0], int(keys[1]), keys[2]
+            elif len(keys) == 2:
+                yield keys[0], None, keys[1]
+            else:
+                yield keys[0], None, None
+
     def _make_plan(self, game):
         activeplayerName = self.getActivePlayerName(game)
         if activeplayerName != "" and self.isUndoOptionAvailable(game):
@@ -684,76 +870,10 @@ class DrefsanteBot(ProcBot):
         actionAI = self.ffaiProxy.playTurn(activeplayerName)
 
         logger.debug(actionAI)
-        actions = actionAI.split("\n")
-        for action in actions:
-            keys = action.split(";")
-            actionKey = keys[0]
-
-            if actionKey == "START_MOVE":
-                mover = self.getUnitFromName(game, keys[1])
-                self.actions.append(Action(ActionType.START_MOVE, player=mover))
-            elif actionKey == "START_BLITZ":
-                mover = self.getUnitFromName(game, keys[1])
-                self.actions.append(Action(ActionType.START_BLITZ, player=mover))
-            elif actionKey == "START_BLOCK":
-                mover = self.getUnitFromName(game, keys[1])
-                self.actions.append(Action(ActionType.START_BLOCK, player=mover))
-            elif actionKey == "START_PASS":
-                mover = self.getUnitFromName(game, keys[1])
-                self.actions.append(Action(ActionType.START_PASS, player=mover))
-            elif actionKey == "START_HANDOFF":
-                mover = self.getUnitFromName(game, keys[1])
-                self.actions.append(Action(ActionType.START_HANDOFF, player=mover))
-            elif actionKey == "START_FOUL":
-                mover = self.getUnitFromName(game, keys[1])
-                self.actions.append(Action(ActionType.START_FOUL, player=mover))
-            elif actionKey == "MOVE":
-                position = self.getPosition(int(keys[1]))
-                mover = self.getUnitFromName(game, keys[2])
-                self.actions.append(Action(ActionType.MOVE, position, mover))
-            elif actionKey == "END_PLAYER_TURN":
-                mover = self.getUnitFromName(game, keys[1])
-                self.actions.append(Action(ActionType.END_PLAYER_TURN, player=mover))
-            elif actionKey == "STAND_UP":
-                mover = self.getUnitFromName(game, keys[1])
-                if mover.state.up:
-                    logger.debug("Try to rise up player not prone")
-                self.actions.append(Action(ActionType.STAND_UP, player=mover))
-            elif actionKey == "BLOCK":
-                position = self.getPosition(int(keys[1]))
-                mover = self.getUnitFromName(game, keys[2])
-                self.actions.append(Action(ActionType.BLOCK, position, mover))
-            elif actionKey == "PASS":
-                position = self.getPosition(int(keys[1]))
-                mover = self.getUnitFromName(game, keys[2])
-                self.actions.append(Action(ActionType.PASS, position, mover))
-            elif actionKey == "HANDOFF":
-                position = self.getPosition(int(keys[1]))
-                mover = self.getUnitFromName(game, keys[2])
-                self.actions.append(Action(ActionType.HANDOFF, position, mover))
-            elif actionKey == "PICKUP_TEAM_MATE":
-                mover = self.getUnitFromName(game, keys[1])
-                self.actions.append(
-                    Action(ActionType.PICKUP_TEAM_MATE, mover)
-                )  # TODO check
-            elif actionKey == "THROW_TEAM_MATE":
-                position = self.getPosition(int(keys[1]))
-                mover = self.getUnitFromName(game, keys[2])
-                self.actions.append(
-                    Action(ActionType.THROW_TEAM_MATE, position, mover)
-                )  # TODO check
-            elif actionKey == "LEAP":
-                position = self.getPosition(int(keys[1]))
-                mover = self.getUnitFromName(game, keys[2])
-                self.actions.append(
-                    Action(ActionType.LEAP, position, mover)
-                )  # TODO check
-            elif actionKey == "END_TURN":
-                self.actions.append(Action(ActionType.END_TURN))
-            elif actionKey == "FOUL":
-                position = self.getPosition(int(keys[1]))
-                mover = self.getUnitFromName(game, keys[2])
-                self.actions.append(Action(ActionType.FOUL, position, mover))
+        for actionKey, squareId, playerName in self.decodePlan(actionAI):
+            build = PLAN_BUILDERS.get(actionKey)
+            if build is not None:
+                self.actions.append(build(self, game, squareId, playerName))
 
         return
 
@@ -822,6 +942,9 @@ class DrefsanteBot(ProcBot):
         return action
 
     def getPosition(self, squareId):
+        if 0 <= squareId < len(SQUARES):
+            return SQUARES[squareId]
+
         i = squareId // 26 + 1
         j = squareId % 26 + 1
 
@@ -831,22 +954,10 @@ class DrefsanteBot(ProcBot):
         if position is None:
             return -1
 
-        j = position.x - 1
-        i = position.y - 1
-
-        if i >= 0 and i < 15 and j >= 0 and j < 26:
-            return i * 26 + j
+        return SQUARE_IDS.get((position.x, position.y), -1)
 
-        return -1
-
-    def getSquares(self, positions):
-        ArrayList = autoclass("java.util.ArrayList")
-        finalSquares = ArrayList()
-
-        for position in positions:
-            finalSquares.add(self.getSquareId(position))
-
-        return finalSquares
+    def getSquares(self, squareIds):
+        return self.toJavaList(squareIds)
 
     def push(self, game):
         """
@@ -856,7 +967,11 @@ class DrefsanteBot(ProcBot):
 
         pushedPlayer = game.get_procedure().player
         pusherPlayer = game.get_procedure().pusher
-        authorizedSquares = self.getSquares(game.state.available_actions[0].positions)
+        positions = game.state.available_actions[0].positions
+        # Keep the ids on the Python side so the answer is resolved without
+        # another JNI round-trip to read it back from the Java list
+        squareIds = [self.getSquareId(position) for position in positions]
+        authorizedSquares = self.getSquares(squareIds)
 
         if not game.get_procedure().chain:
             self.oldDefensorPosition = self.getSquareId(pushedPlayer.position)
@@ -869,10 +984,10 @@ class DrefsanteBot(ProcBot):
             authorizedSquares,
             isFirstPush,
         )
-        resultSquareId = authorizedSquares.get(result)
+        resultSquareId = squareIds[result]
 
-        for position in game.state.available_actions[0].positions:
-            if self.getSquareId(position) == resultSquareId:
+        for position, squareId in zip(positions, squareIds):
+            if squareId == resultSquareId:
                 logger.debug(
                     "Position selected = ", position, "; SquareId = ", resultSquareId
                 )
@@ -931,10 +1046,12 @@ class DrefsanteBot(ProcBot):
 
         self.updateModel(game)
 
-        ArrayList = autoclass("java.util.ArrayList")
-        interceptorNames = ArrayList()
-        for interceptor in game.get_procedure().interceptors:
-            interceptorNames.add(self.getName(game, interceptor))
+        interceptorNames = self.toJavaList(
+            [
+                self.getName(game, interceptor)
+                for interceptor in game.get_procedure().interceptors
+            ]
+        )
 
         index = self.ffaiProxy.askPlayerToIntercept(
             self.getName(game, game.get_procedure().passer), interceptorNames
@@ -1058,9 +1175,14 @@ class DrefsanteBot(ProcBot):
         """
         self.ffaiProxy.endGame()
 
-        filePrefixWithPath = Path(self.temporaryFolder) / game.game_id
+        self.logQueue.put(None)
+        self.logWriter.join()
+
+        for fd in self.teamFiles.values():
+            os.close(fd)
+        self.teamFiles.clear()
 
-        if (filePrefixWithPath / "team1").exists():
-            (filePrefixWithPath / "team1").unlink()
-        if (filePrefixWithPath / "team2").exists():
-            (filePrefixWithPath / "team2").unlink()
+        if (self.gameFolder / "team1").exists():
+            (self.gameFolder / "team1").unlink()
+        if (self.gameFolder / "team2").exists():
+            (self.gameFolder / "team2").unlink()
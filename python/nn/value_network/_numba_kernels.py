@@ -0,0 +1,49 @@
+"""
+Numba kernels for the Blood Bowl value network dataset.
+
+Numba is optional. When it is not installed, the kernels are None and the
+dataset falls back to its NumPy implementation.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _scatter_team(
+    xs: np.ndarray,
+    ys: np.ndarray,
+    features: np.ndarray,
+    spatial_layers: np.ndarray,
+    layer_offset: int,
+) -> None:
+    """
+    Write the features of a team's players into the spatial layers.
+
+    Args:
+        xs: int32 array (N,) of player x coordinates.
+        ys: int32 array (N,) of player y coordinates.
+        features: uint8 array (N, LAYERS_PER_TEAM) of player features.
+        spatial_layers: uint8 array (C, W, H) written in place at [channel, x, y].
+        layer_offset: First channel of the team layers.
+    """
+    for i in range(xs.shape[0]):
+        x = xs[i]
+        y = ys[i]
+        for k in range(features.shape[1]):
+            spatial_layers[layer_offset + k, x, y] = features[i, k]
+
+
+# The signature is given so the kernel is compiled ahead of time when the module is
+# imported, rather than on the first sample parsed by each worker. It is cached on
+# disk, so later processes skip the compilation
+SCATTER_TEAM_SIGNATURE = "void(int32[:], int32[:], uint8[:, :], uint8[:, :, :], int64)"
+
+scatter_team = (
+    njit(SCATTER_TEAM_SIGNATURE, cache=True, fastmath=True)(_scatter_team)
+    if njit is not None
+    else None
+)
@@ -0,0 +1,32 @@
+import argparse
+from pathlib import Path
+
+from nn.value_network.dataset import BloodBowlDataset
+
+
+def main(data_file: str | Path, output: str | Path | None = None):
+    data_file = Path(data_file)
+    output = Path(output) if output is not None else data_file.with_suffix(".parquet")
+    BloodBowlDataset.build_parquet(data_file, output)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Convert labeled game states from JSONL to a Parquet dataset"
+    )
+    parser.add_argument(
+        "-d",
+        "--data-file",
+        type=Path,
+        default="data/merged.jsonl",
+        help="Labeled game states written by label_data",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=Path,
+        default=None,
+        help="Parquet file to write (defaults to the data file with .parquet suffix)",
+    )
+    args = parser.parse_args()
+    main(args.data_file, args.output)
@@ -7,13 +7,36 @@ output in the range [-1, 1].
 """
 
 import json
+import os
+import warnings
+from collections.abc import Iterator
+from itertools import count, islice
+from operator import itemgetter
 from pathlib import Path
 from typing import Any
 
 import numpy as np
 import pytorch_lightning as pl
 import torch
-from torch.utils.data import DataLoader, Dataset, random_split
+from torch.utils.data import (
+    DataLoader,
+    Dataset,
+    IterableDataset,
+    default_collate,
+    get_worker_info,
+    random_split,
+)
+
+from nn.value_network._numba_kernels import scatter_team
+
+# orjson parses the JSONL samples several times faster; it is optional
+try:
+    from orjson import loads as loads_json
+except ImportError:
+    from json import loads as loads_json
+
+# Player fields read in the per-player loop of parse_game_state
+get_attributes = itemgetter("ma", "st", "ag", "av")
 
 
 class BloodBowlDataset(Dataset):
@@ -32,6 +55,12 @@ class BloodBowlDataset(Dataset):
         - Absolute Representation: The board is represented from a fixed perspective,
           with home team features always in the same channels and away team in others.
         - Loads from merged.jsonl file for efficient storage and loading.
+        - Optionally reads from a tensor cache built once with `build_cache`, so the
+          JSON is not parsed again on every epoch.
+
+    DataLoaders over this dataset (or a Subset of it) must use
+    `collate_fn=collate_batch`: `__getitems__` returns each batch already stacked,
+    which the default collate function cannot handle.
     """
 
     # Board dimensions
@@ -41,6 +70,26 @@ class BloodBowlDataset(Dataset):
     # Number of spatial layers per team
     LAYERS_PER_TEAM = 13
 
+    # Skills with a spatial layer, in layer order after the 8 player layers
+    SKILL_LAYERS = ("BLOCK", "DODGE", "SURE_HANDS", "CATCH", "PASS")
+
+    # Tensor sizes of a single sample
+    NUM_SPATIAL_LAYERS = 27
+    NUM_NON_SPATIAL_FEATURES = 15
+
+    # All spatial layers are flags or player stats (0-15), so the board is stored as
+    # uint8 and only cast to float32 by the model, on its device
+    SPATIAL_DTYPE = np.uint8
+
+    # Files of a tensor cache built by build_cache
+    CACHE_META = "meta.json"
+    CACHE_SPATIAL = "spatial.u8"
+    CACHE_NON_SPATIAL = "nonspatial.f32"
+    CACHE_LABELS = "labels.f32"
+
+    # Samples per row group of a Parquet dataset written by build_parquet
+    PARQUET_ROW_GROUP_SIZE = 4096
+
     # Weather types for one-hot encoding (must match Rust WeatherType enum names)
     WEATHER_TYPES = [
         "NICE",
@@ -49,27 +98,117 @@ class BloodBowlDataset(Dataset):
         "BLIZZARD",
         "SWELTERING_HEAT",
     ]
+    # One-hot encoding of each weather, unknown weathers are encoded as NICE
+    WEATHER_ONEHOT = dict(
+        zip(WEATHER_TYPES, np.eye(len(WEATHER_TYPES), dtype=np.float32))
+    )
 
-    def __init__(self, data_file: Path):
+    def __init__(
+        self, data_file: Path, cache_dir: Path | None = None, preparse: bool = False
+    ):
         """
         Initialize the dataset.
 
         Args:
             data_file: Path to the merged.jsonl file containing labeled game states.
+                A .parquet file written by `build_parquet` is read column-wise
+                instead.
+            cache_dir: Optional directory holding a tensor cache built by `build_cache`.
+                When the cache exists, samples are memory-mapped from it and
+                data_file is not read.
+            preparse: Parse every JSON sample once up front and keep only the
+                resulting tensors in memory, instead of parsing on every access.
         """
         self.samples: list[dict] = []
+        self.spatial: torch.Tensor | None = None
+        self.non_spatial: torch.Tensor | None = None
+        self.labels: torch.Tensor | None = None
+        self.cache_dir: Path | None = None
+        self.parquet_path: Path | None = None
+
+        if cache_dir is not None and (Path(cache_dir) / self.CACHE_META).exists():
+            self.cache_dir = Path(cache_dir)
+            self._open_cache(self.cache_dir)
+            print(
+                f"Dataset cache opened from {self.cache_dir}. "
+                f"Found {len(self.labels)} samples."
+            )
+            return
+
+        if Path(data_file).suffix == ".parquet":
+            self.parquet_path = Path(data_file)
+            self._open_parquet(self.parquet_path)
+            return
+
         print(f"Loading dataset from {data_file}...")
-        with open(data_file) as f:
+        with open(data_file, "rb") as f:
             for line in f:
                 line = line.strip()
                 if line:
-                    self.samples.append(json.loads(line))
+                    self.samples.append(loads_json(line))
         print(f"Dataset loaded. Found {len(self.samples)} training samples.")
 
+        if preparse:
+            self._preparse()
+
+    def _preparse(self) -> None:
+        """Parse all loaded samples into tensors and release the JSON dicts."""
+        num_samples = len(self.samples)
+        # Zeroed since the samples are parsed in place
+        self.spatial = torch.from_numpy(
+            np.zeros(
+                (
+                    num_samples,
+                    self.NUM_SPATIAL_LAYERS,
+                    self.BOARD_WIDTH,
+                    self.BOARD_HEIGHT,
+                ),
+                dtype=self.SPATIAL_DTYPE,
+            )
+        )
+        self.non_spatial = torch.empty(
+            (num_samples, self.NUM_NON_SPATIAL_FEATURES), dtype=torch.float32
+        )
+        self.labels = torch.empty((num_samples, 1), dtype=torch.float32)
+
+        for idx, state in enumerate(self.samples):
+            _, self.non_spatial[idx] = self.parse_game_state(
+                state, out=self.spatial[idx].numpy()
+            )
+            self.labels[idx, 0] = state["score"]
+
+        # The dicts take far more memory than the tensors
+        self.samples = []
+        print("Dataset preparsed.")
+
+    def share_memory(self) -> None:
+        """
+        Move the preparsed tensors to shared memory.
+
+        DataLoader workers then all read the same pages instead of each receiving
+        its own copy of the dataset. Cache and Parquet tensors are left as they
+        are since they are already mapped from their files.
+        """
+        if (
+            self.labels is None
+            or self.cache_dir is not None
+            or self.parquet_path is not None
+        ):
+            return
+        self.spatial.share_memory_()
+        self.non_spatial.share_memory_()
+        self.labels.share_memory_()
+
     def __len__(self) -> int:
+        if self.labels is not None:
+            return len(self.labels)
         return len(self.samples)
 
     def __getitem__(self, idx: int) -> tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        if self.labels is not None:
+            # Preparsed rows: no parsing and no copy
+            return self.spatial[idx], self.non_spatial[idx], self.labels[idx]
+
         state = self.samples[idx]
 
         spatial_input, non_spatial_input = self.parse_game_state(state)
@@ -78,29 +217,366 @@ class BloodBowlDataset(Dataset):
 
         return spatial_input, non_spatial_input, label
 
+    def __getitems__(
+        self, indices: list[int]
+    ) -> tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """
+        Fetch a whole batch at once.
+
+        The batch is returned already collated, so DataLoaders must pass it through
+        with `collate_batch` instead of the default collate function. Preparsed
+        tensors are gathered with one index_select per tensor, and JSON samples
+        are parsed straight into the rows of the batch.
+        """
+        if self.labels is None:
+            return self._parse_batch(indices)
+
+        index = torch.as_tensor(indices, dtype=torch.long)
+        return (
+            self._gather(self.spatial, index),
+            self._gather(self.non_spatial, index),
+            self._gather(self.labels, index),
+        )
+
+    def _parse_batch(
+        self, indices: list[int]
+    ) -> tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """Parse JSON samples in place into preallocated batch tensors."""
+        spatial = self._empty_batch(
+            (
+                len(indices),
+                self.NUM_SPATIAL_LAYERS,
+                self.BOARD_WIDTH,
+                self.BOARD_HEIGHT,
+            ),
+            torch.uint8,  # SPATIAL_DTYPE
+        ).zero_()
+        non_spatial = self._empty_batch(
+            (len(indices), self.NUM_NON_SPATIAL_FEATURES), torch.float32
+        )
+        labels = self._empty_batch((len(indices), 1), torch.float32)
+
+        for row, idx in enumerate(indices):
+            state = self.samples[idx]
+            _, non_spatial[row] = self.parse_game_state(
+                state, out=spatial[row].numpy()
+            )
+            labels[row, 0] = state["score"]
+
+        return spatial, non_spatial, labels
+
+    @staticmethod
+    def _empty_batch(shape: tuple[int, ...], dtype: torch.dtype) -> torch.Tensor:
+        """Allocate a batch tensor, in shared memory when in a DataLoader worker."""
+        out = torch.empty(shape, dtype=dtype)
+        if get_worker_info() is not None:
+            # Worker batches reach the main process through shared memory; writing
+            # there directly avoids copying the batch again when it is sent
+            out.share_memory_()
+        return out
+
+    @classmethod
+    def _gather(cls, tensor: torch.Tensor, index: torch.Tensor) -> torch.Tensor:
+        """Gather rows into a batch tensor."""
+        out = cls._empty_batch((len(index), *tensor.shape[1:]), tensor.dtype)
+        return torch.index_select(tensor, 0, index, out=out)
+
+    @classmethod
+    def build_cache(cls, jsonl_path: Path, cache_dir: Path) -> Path:
+        """
+        Parse every labeled game state once and store the tensors in a cache.
+
+        The cache is made of three raw files, memory-mapped by the dataset:
+        uint8 spatial (N, 27, W, H), float32 non-spatial (N, 15) and float32
+        labels (N, 1), plus a small meta.json describing them.
+
+        Args:
+            jsonl_path: Path to the merged.jsonl file containing labeled game states.
+            cache_dir: Directory to write the cache to.
+
+        Returns:
+            The cache directory.
+        """
+        jsonl_path = Path(jsonl_path)
+        cache_dir = Path(cache_dir)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+
+        with open(jsonl_path, "rb") as f:
+            num_samples = sum(1 for line in f if line.strip())
+
+        spatial_shape = (cls.NUM_SPATIAL_LAYERS, cls.BOARD_WIDTH, cls.BOARD_HEIGHT)
+        spatial = np.memmap(
+            cache_dir / cls.CACHE_SPATIAL,
+            dtype=cls.SPATIAL_DTYPE,
+            mode="w+",
+            shape=(num_samples, *spatial_shape),
+        )
+        non_spatial = np.memmap(
+            cache_dir / cls.CACHE_NON_SPATIAL,
+            dtype=np.float32,
+            mode="w+",
+            shape=(num_samples, cls.NUM_NON_SPATIAL_FEATURES),
+        )
+        labels = np.memmap(
+            cache_dir / cls.CACHE_LABELS,
+            dtype=np.float32,
+            mode="w+",
+            shape=(num_samples, 1),
+        )
+
+        print(f"Building tensor cache for {num_samples} samples in {cache_dir}...")
+        idx = 0
+        with open(jsonl_path, "rb") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                state = loads_json(line)
+                spatial_input, non_spatial_input = cls.parse_game_state(state)
+                spatial[idx] = spatial_input.numpy()
+                non_spatial[idx] = non_spatial_input.numpy()
+                labels[idx, 0] = state["score"]
+                idx += 1
+
+        spatial.flush()
+        non_spatial.flush()
+        labels.flush()
+
+        meta = {
+            "num_samples": num_samples,
+            "spatial_shape": list(spatial_shape),
+            "spatial_dtype": np.dtype(cls.SPATIAL_DTYPE).name,
+            "non_spatial_features": cls.NUM_NON_SPATIAL_FEATURES,
+        }
+        (cache_dir / cls.CACHE_META).write_text(json.dumps(meta))
+        print("Tensor cache built.")
+
+        return cache_dir
+
+    def _open_cache(self, cache_dir: Path) -> None:
+        """Memory-map the tensors of a cache built by build_cache."""
+        meta = json.loads((cache_dir / self.CACHE_META).read_text())
+        num_samples = meta["num_samples"]
+
+        # Copy-on-write so the maps can be handed to torch without a copy or a
+        # read-only warning, while the cache files are never modified
+        self.spatial = torch.from_numpy(
+            np.memmap(
+                cache_dir / self.CACHE_SPATIAL,
+                dtype=meta["spatial_dtype"],
+                mode="c",
+                shape=(num_samples, *meta["spatial_shape"]),
+            )
+        )
+        self.non_spatial = torch.from_numpy(
+            np.memmap(
+                cache_dir / self.CACHE_NON_SPATIAL,
+                dtype=np.float32,
+                mode="c",
+                shape=(num_samples, meta["non_spatial_features"]),
+            )
+        )
+        self.labels = torch.from_numpy(
+            np.memmap(
+                cache_dir / self.CACHE_LABELS,
+                dtype=np.float32,
+                mode="c",
+                shape=(num_samples, 1),
+            )
+        )
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Spawned DataLoader workers reopen the cache maps instead of receiving a
+        # pickled copy of the whole cache
+        state = self.__dict__.copy()
+        if self.cache_dir is not None:
+            state["spatial"] = state["non_spatial"] = state["labels"] = None
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        if self.cache_dir is not None:
+            self._open_cache(self.cache_dir)
+
+    @classmethod
+    def build_parquet(cls, jsonl_path: Path, parquet_path: Path) -> Path:
+        """
+        Parse every labeled game state once and store the tensors in a Parquet file.
+
+        Columns:
+            - spatial: (27, W, H) spatial tensor packed as uint8 bytes
+            - non_spatial: the 15 non-spatial float32 features
+            - score: the float32 label
+
+        Args:
+            jsonl_path: Path to the merged.jsonl file containing labeled game states.
+            parquet_path: Path of the Parquet file to write.
+
+        Returns:
+            The Parquet file path.
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError(
+                "pyarrow is required for Parquet datasets. "
+                "Install it with: pip install pyarrow"
+            )
+
+        spatial_size = cls.NUM_SPATIAL_LAYERS * cls.BOARD_WIDTH * cls.BOARD_HEIGHT
+        schema = pa.schema(
+            [
+                ("spatial", pa.binary(spatial_size)),
+                ("non_spatial", pa.list_(pa.float32(), cls.NUM_NON_SPATIAL_FEATURES)),
+                ("score", pa.float32()),
+            ]
+        )
+
+        parquet_path = Path(parquet_path)
+        print(f"Converting {jsonl_path} to {parquet_path}...")
+        num_samples = 0
+        with (
+            open(jsonl_path, "rb") as f,
+            pq.ParquetWriter(parquet_path, schema) as writer,
+        ):
+            spatial, non_spatial, scores = [], [], []
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                state = loads_json(line)
+                spatial_input, non_spatial_input = cls.parse_game_state(state)
+                spatial.append(spatial_input.numpy().tobytes())
+                non_spatial.append(non_spatial_input.numpy())
+                scores.append(state["score"])
+
+                # Bounded row groups keep the conversion memory flat
+                if len(scores) == cls.PARQUET_ROW_GROUP_SIZE:
+                    writer.write_table(
+                        cls._parquet_table(schema, spatial, non_spatial, scores)
+                    )
+                    num_samples += len(scores)
+                    spatial, non_spatial, scores = [], [], []
+
+            if scores:
+                writer.write_table(
+                    cls._parquet_table(schema, spatial, non_spatial, scores)
+                )
+                num_samples += len(scores)
+
+        print(f"Wrote {num_samples} samples to {parquet_path}")
+        return parquet_path
+
+    @staticmethod
+    def _parquet_table(
+        schema: Any,
+        spatial: list[bytes],
+        non_spatial: list[np.ndarray],
+        scores: list[float],
+    ) -> Any:
+        """Build a Parquet row group from the parsed samples."""
+        import pyarrow as pa
+
+        return pa.Table.from_arrays(
+            [
+                pa.array(spatial, type=schema.field("spatial").type),
+                pa.FixedSizeListArray.from_arrays(
+                    pa.array(np.concatenate(non_spatial), type=pa.float32()),
+                    schema.field("non_spatial").type.list_size,
+                ),
+                pa.array(scores, type=pa.float32()),
+            ],
+            schema=schema,
+        )
+
+    def _open_parquet(self, parquet_path: Path) -> None:
+        """Read the columns of a Parquet file written by build_parquet."""
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError(
+                "pyarrow is required for Parquet datasets. "
+                "Install it with: pip install pyarrow"
+            )
+
+        print(f"Loading dataset from {parquet_path}...")
+        table = pq.read_table(parquet_path, memory_map=True, use_threads=True)
+        self.spatial, self.non_spatial, self.labels = self._parquet_tensors(table)
+        print(f"Dataset loaded. Found {table.num_rows} training samples.")
+
+    @classmethod
+    def _parquet_tensors(
+        cls, table: Any
+    ) -> tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """Wrap the columns of a table written by build_parquet as tensors."""
+        num_samples = table.num_rows
+
+        # Fixed size binary values sit back to back in the data buffer
+        spatial_column = table.column("spatial").combine_chunks()
+        spatial_size = spatial_column.type.byte_width
+        spatial = np.frombuffer(
+            spatial_column.buffers()[1],
+            dtype=cls.SPATIAL_DTYPE,
+            count=num_samples * spatial_size,
+            offset=spatial_column.offset * spatial_size,
+        ).reshape(
+            num_samples, cls.NUM_SPATIAL_LAYERS, cls.BOARD_WIDTH, cls.BOARD_HEIGHT
+        )
+        non_spatial = (
+            table.column("non_spatial")
+            .combine_chunks()
+            .flatten()
+            .to_numpy(zero_copy_only=True)
+            .reshape(num_samples, cls.NUM_NON_SPATIAL_FEATURES)
+        )
+        labels = (
+            table.column("score")
+            .combine_chunks()
+            .to_numpy(zero_copy_only=True)
+            .reshape(num_samples, 1)
+        )
+
+        # Arrow buffers are read-only, which torch warns about; the dataset never
+        # writes to them. The uint8 spatial tensor is cast by the model.
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", UserWarning)
+            return (
+                torch.from_numpy(spatial),
+                torch.from_numpy(non_spatial),
+                torch.from_numpy(labels),
+            )
+
     @classmethod
     def parse_game_state(
-        cls, game_state: dict[str, Any]
+        cls, game_state: dict[str, Any], out: np.ndarray | None = None
     ) -> tuple[torch.Tensor, torch.Tensor]:
         """
         Parse a game state into spatial and non-spatial tensors.
 
         The board is represented from a fixed "home vs away" perspective.
-        Spatial tensor shape is (C, W, H) where:
+        Spatial tensor is uint8 (see SPATIAL_DTYPE) with shape (C, W, H) where:
         - C = 27 channels
         - W = 28 (BOARD_WIDTH, x-axis)
         - H = 17 (BOARD_HEIGHT, y-axis)
 
         Args:
             game_state: Dictionary containing the game state.
+            out: Optional zeroed (C, W, H) array of SPATIAL_DTYPE the spatial layers
+                are written to, such as a row of a preallocated batch. The returned
+                spatial tensor then shares its memory.
 
         Returns:
             Tuple of (spatial_input, non_spatial_input) tensors.
         """
         # Shape: (C, W, H) - Width first, then Height
-        spatial_layers = np.zeros(
-            (27, cls.BOARD_WIDTH, cls.BOARD_HEIGHT), dtype=np.float32
-        )
+        if out is not None:
+            spatial_layers = out
+        else:
+            spatial_layers = np.zeros(
+                (cls.NUM_SPATIAL_LAYERS, cls.BOARD_WIDTH, cls.BOARD_HEIGHT),
+                dtype=cls.SPATIAL_DTYPE,
+            )
 
         # Layer 0: Ball Position
         if game_state.get("balls") and game_state["balls"][0].get("position"):
@@ -111,93 +587,220 @@ class BloodBowlDataset(Dataset):
         def process_team(team_data: dict[str, Any], layer_offset: int) -> None:
             """Process a team's players into spatial layers.
 
-            Uses (x, y) indexing for (C, W, H) layout.
+            Uses (x, y) indexing for (C, W, H) layout. The player features are
+            gathered once per team and scattered into the team layers with a
+            single fancy-indexed assignment.
             """
+            xs: list[int] = []
+            ys: list[int] = []
+            features: list[list[float]] = []
+            # Local aliases for the per-player loop
+            append_x = xs.append
+            append_y = ys.append
+            append_features = features.append
+            skill_layers = cls.SKILL_LAYERS
             for player in team_data.get("players_by_id", {}).values():
-                if player.get("position"):
-                    x, y = player["position"]["x"], player["position"]["y"]
-
-                    # Player position - index as [channel, x, y]
-                    spatial_layers[layer_offset + 0, x, y] = 1
-
-                    # Attributes (normalized would be better, but kept as-is for compatibility)
-                    spatial_layers[layer_offset + 1, x, y] = player["ma"]
-                    spatial_layers[layer_offset + 2, x, y] = player["st"]
-                    spatial_layers[layer_offset + 3, x, y] = player["ag"]
-                    spatial_layers[layer_offset + 4, x, y] = player["av"]
-
-                    # State flags
-                    state = player.get("state", {})
-                    spatial_layers[layer_offset + 5, x, y] = (
-                        1 if state.get("up", False) else 0
-                    )
-                    spatial_layers[layer_offset + 6, x, y] = (
-                        1 if state.get("used", False) else 0
-                    )
-                    spatial_layers[layer_offset + 7, x, y] = (
-                        1 if state.get("stunned", False) else 0
-                    )
-
-                    # Skills
-                    skills = player.get("skills", [])
-                    spatial_layers[layer_offset + 8, x, y] = (
-                        1 if "BLOCK" in skills else 0
-                    )
-                    spatial_layers[layer_offset + 9, x, y] = (
-                        1 if "DODGE" in skills else 0
-                    )
-                    spatial_layers[layer_offset + 10, x, y] = (
-                        1 if "SURE_HANDS" in skills else 0
-                    )
-                    spatial_layers[layer_offset + 11, x, y] = (
-                        1 if "CATCH" in skills else 0
-                    )
-                    spatial_layers[layer_offset + 12, x, y] = (
-                        1 if "PASS" in skills else 0
-                    )
+                position = player.get("position")
+                if not position:
+                    continue
+
+                get_state = player.get("state", {}).get
+                skills = set(player.get("skills", ()))
+                append_x(position["x"])
+                append_y(position["y"])
+                append_features(
+                    [
+                        # Player position
+                        1,
+                        # Attributes (normalized would be better, but kept as-is for compatibility)
+                        *get_attributes(player),
+                        # State flags
+                        bool(get_state("up", False)),
+                        bool(get_state("used", False)),
+                        bool(get_state("stunned", False)),
+                        # Skills
+                        *[skill in skills for skill in skill_layers],
+                    ]
+                )
+
+            if not xs:
+                return
+
+            if scatter_team is not None:
+                scatter_team(
+                    np.asarray(xs, dtype=np.int32),
+                    np.asarray(ys, dtype=np.int32),
+                    np.asarray(features, dtype=cls.SPATIAL_DTYPE),
+                    spatial_layers,
+                    layer_offset,
+                )
+            else:
+                # (LAYERS_PER_TEAM, num_players) written at [channel, x, y]
+                spatial_layers[
+                    layer_offset : layer_offset + cls.LAYERS_PER_TEAM, xs, ys
+                ] = np.asarray(features, dtype=cls.SPATIAL_DTYPE).T
 
         # Process teams (home at offset 1, away at offset 14)
         process_team(game_state.get("home_team", {}), layer_offset=1)
         process_team(game_state.get("away_team", {}), layer_offset=14)
 
-        # Non-spatial features
+        # Non-spatial features, written in place
         home_team = game_state.get("home_team", {})
         away_team = game_state.get("away_team", {})
 
-        non_spatial_features = [
-            float(game_state.get("half", 1)),
-            float(game_state.get("round", 0)),
-            float(home_team.get("rerolls", 0)),
-            float(home_team.get("score", 0)),
-            float(away_team.get("rerolls", 0)),
-            float(away_team.get("score", 0)),
-        ]
+        non_spatial_features = np.empty(cls.NUM_NON_SPATIAL_FEATURES, dtype=np.float32)
+        non_spatial_features[0] = game_state.get("half", 1)
+        non_spatial_features[1] = game_state.get("round", 0)
+        non_spatial_features[2] = home_team.get("rerolls", 0)
+        non_spatial_features[3] = home_team.get("score", 0)
+        non_spatial_features[4] = away_team.get("rerolls", 0)
+        non_spatial_features[5] = away_team.get("score", 0)
 
         # Turn state features
         turn_state = game_state.get("turn_state")
         if turn_state:
-            non_spatial_features.extend(
-                [
-                    1.0 if turn_state.get("blitz_available", False) else 0.0,
-                    1.0 if turn_state.get("pass_available", False) else 0.0,
-                    1.0 if turn_state.get("handoff_available", False) else 0.0,
-                    1.0 if turn_state.get("foul_available", False) else 0.0,
-                ]
-            )
+            non_spatial_features[6] = bool(turn_state.get("blitz_available", False))
+            non_spatial_features[7] = bool(turn_state.get("pass_available", False))
+            non_spatial_features[8] = bool(turn_state.get("handoff_available", False))
+            non_spatial_features[9] = bool(turn_state.get("foul_available", False))
         else:
-            non_spatial_features.extend([0.0, 0.0, 0.0, 0.0])
+            non_spatial_features[6:10] = 0.0
 
         # Weather one-hot encoding
-        weather = game_state.get("weather", "NICE")
-        weather_encoding = [1.0 if w == weather else 0.0 for w in cls.WEATHER_TYPES]
-        non_spatial_features.extend(weather_encoding)
+        non_spatial_features[10:] = cls.WEATHER_ONEHOT.get(
+            game_state.get("weather", "NICE"), cls.WEATHER_ONEHOT["NICE"]
+        )
 
         spatial_input = torch.from_numpy(spatial_layers)
-        non_spatial_input = torch.tensor(non_spatial_features, dtype=torch.float32)
+        non_spatial_input = torch.from_numpy(non_spatial_features)
 
         return spatial_input, non_spatial_input
 
 
+class BloodBowlIterableDataset(IterableDataset):
+    """
+    Streaming variant of BloodBowlDataset for datasets larger than memory.
+
+    Samples are read from merged.jsonl (or a Parquet file written by
+    `BloodBowlDataset.build_parquet`) and parsed while iterating, in file order.
+    Only the sample being parsed, or the Parquet row group being read, is held in
+    memory. With several DataLoader workers, each worker reads every
+    num_workers-th line or row group.
+
+    Splits are made by sample index: out of every SPLIT_PERIOD samples, the first
+    ones go to the test split, the next ones to the validation split and the rest
+    to the training split.
+    """
+
+    SPLIT_PERIOD = 1000
+
+    def __init__(
+        self,
+        data_file: Path,
+        split: str = "train",
+        val_split: float = 0.0,
+        test_split: float = 0.0,
+    ):
+        """
+        Initialize the dataset.
+
+        Args:
+            data_file: Path to the merged.jsonl or .parquet file.
+            split: Either 'train', 'val' or 'test'.
+            val_split: Fraction of data to use for validation (0 to 1).
+            test_split: Fraction of data to use for testing (0 to 1).
+        """
+        self.data_file = Path(data_file)
+
+        test_end = round(test_split * self.SPLIT_PERIOD)
+        val_end = test_end + round(val_split * self.SPLIT_PERIOD)
+        bounds = {
+            "test": (0, test_end),
+            "val": (test_end, val_end),
+            "train": (val_end, self.SPLIT_PERIOD),
+        }
+        if split not in bounds:
+            raise ValueError(f"Unknown split: {split}")
+        self.buckets = range(*bounds[split])
+
+    def __iter__(self) -> Iterator[tuple[torch.Tensor, torch.Tensor, torch.Tensor]]:
+        worker_info = get_worker_info()
+        if worker_info is None:
+            worker_id, num_workers = 0, 1
+        else:
+            worker_id, num_workers = worker_info.id, worker_info.num_workers
+
+        if self.data_file.suffix == ".parquet":
+            return self._iter_parquet(worker_id, num_workers)
+        return self._iter_jsonl(worker_id, num_workers)
+
+    def _iter_jsonl(
+        self, worker_id: int, num_workers: int
+    ) -> Iterator[tuple[torch.Tensor, torch.Tensor, torch.Tensor]]:
+        """Parse the lines of this worker which belong to the split."""
+        with open(self.data_file, "rb") as f:
+            lines = islice(f, worker_id, None, num_workers)
+            for index, line in zip(count(worker_id, num_workers), lines):
+                if index % self.SPLIT_PERIOD not in self.buckets:
+                    continue
+                line = line.strip()
+                if not line:
+                    continue
+                state = loads_json(line)
+                spatial_input, non_spatial_input = BloodBowlDataset.parse_game_state(
+                    state
+                )
+                label = torch.tensor([state["score"]], dtype=torch.float32)
+                yield spatial_input, non_spatial_input, label
+
+    def _iter_parquet(
+        self, worker_id: int, num_workers: int
+    ) -> Iterator[tuple[torch.Tensor, torch.Tensor, torch.Tensor]]:
+        """Read the row groups of this worker and yield the rows of the split."""
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError(
+                "pyarrow is required for Parquet datasets. "
+                "Install it with: pip install pyarrow"
+            )
+
+        parquet_file = pq.ParquetFile(self.data_file, memory_map=True)
+        metadata = parquet_file.metadata
+        offsets = np.cumsum(
+            [0]
+            + [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)]
+        )
+        for group in range(worker_id, metadata.num_row_groups, num_workers):
+            buckets = np.arange(offsets[group], offsets[group + 1]) % self.SPLIT_PERIOD
+            rows = np.flatnonzero(
+                (buckets >= self.buckets.start) & (buckets < self.buckets.stop)
+            )
+            if not len(rows):
+                continue
+            spatial, non_spatial, labels = BloodBowlDataset._parquet_tensors(
+                parquet_file.read_row_group(group)
+            )
+            for row in rows:
+                yield spatial[row], non_spatial[row], labels[row]
+
+
+# Parsing JSON samples is CPU bound, so loading scales with worker processes
+DEFAULT_NUM_WORKERS = (os.cpu_count() or 2) // 2
+
+
+def collate_batch(batch: tuple | list) -> Any:
+    """
+    Collate function for BloodBowlDataset.
+
+    Batches already gathered by `BloodBowlDataset.__getitems__` are passed through;
+    lists of samples are collated by the default collate function.
+    """
+    if isinstance(batch, tuple):
+        return batch
+    return default_collate(batch)
+
+
 class BloodBowlDataModule(pl.LightningDataModule):
     """
     PyTorch Lightning DataModule for Blood Bowl game state data.
@@ -211,8 +814,15 @@ class BloodBowlDataModule(pl.LightningDataModule):
         batch_size: int = 32,
         val_split: float = 0.1,
         test_split: float = 0.0,
-        num_workers: int = 0,
+        num_workers: int = DEFAULT_NUM_WORKERS,
+        prefetch_factor: int = 4,
+        pin_memory: bool = True,
+        persistent_workers: bool = True,
         seed: int = 42,
+        cache_dir: str | Path | None = None,
+        preparse: bool = False,
+        streaming: bool = False,
+        drop_last: bool = False,
     ):
         """
         Initialize the data module.
@@ -222,8 +832,23 @@ class BloodBowlDataModule(pl.LightningDataModule):
             batch_size: Batch size for DataLoaders.
             val_split: Fraction of data to use for validation (0 to 1).
             test_split: Fraction of data to use for testing (0 to 1).
-            num_workers: Number of workers for DataLoaders.
+            num_workers: Number of workers for DataLoaders (half the CPUs by default).
+            prefetch_factor: Batches loaded in advance by each worker.
+            pin_memory: Load batches into pinned memory, for asynchronous copies to
+                the GPU.
+            persistent_workers: Keep the workers alive between epochs instead of
+                starting them again.
             seed: Random seed for reproducible splits.
+            cache_dir: Optional directory for the dataset tensor cache. It is built
+                from data_file on first use and reused by later runs.
+            preparse: Parse the whole dataset once in setup and keep it in memory
+                as tensors. Ignored when a tensor cache or Parquet file is used.
+            streaming: Stream samples from data_file while training instead of
+                loading the dataset, for datasets larger than memory (see
+                `BloodBowlIterableDataset`). Samples are then read in file order and
+                cache_dir and preparse are ignored.
+            drop_last: Drop the last incomplete training batch, so every training
+                step sees the same batch shape.
         """
         super().__init__()
         self.save_hyperparameters()
@@ -233,12 +858,34 @@ class BloodBowlDataModule(pl.LightningDataModule):
         self.val_split = val_split
         self.test_split = test_split
         self.num_workers = num_workers
+        self.prefetch_factor = prefetch_factor
+        self.pin_memory = pin_memory
+        self.persistent_workers = persistent_workers
         self.seed = seed
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.preparse = preparse
+        self.streaming = streaming
+        self.drop_last = drop_last
 
         self.train_dataset: Dataset | None = None
         self.val_dataset: Dataset | None = None
         self.test_dataset: Dataset | None = None
 
+    def prepare_data(self) -> None:
+        """
+        Build the tensor cache once, if one is requested and missing.
+
+        The cache is only built from JSONL; a Parquet dataset is already read
+        column-wise, so it is loaded directly and no cache is written for it.
+        """
+        if (
+            not self.streaming
+            and self.cache_dir is not None
+            and self.data_file.suffix != ".parquet"
+            and not (self.cache_dir / BloodBowlDataset.CACHE_META).exists()
+        ):
+            BloodBowlDataset.build_cache(self.data_file, self.cache_dir)
+
     def setup(self, stage: str | None = None) -> None:
         """
         Set up datasets for each stage.
@@ -249,8 +896,18 @@ class BloodBowlDataModule(pl.LightningDataModule):
         if self.train_dataset is not None:
             return  # Already set up
 
+        if self.streaming:
+            self._setup_streaming()
+            return
+
         # Create a full dataset
-        full_dataset = BloodBowlDataset(data_file=self.data_file)
+        full_dataset = BloodBowlDataset(
+            data_file=self.data_file,
+            cache_dir=self.cache_dir,
+            preparse=self.preparse,
+        )
+        if self.num_workers > 0:
+            full_dataset.share_memory()
 
         # Calculate split sizes
         total_size = len(full_dataset)
@@ -284,15 +941,35 @@ class BloodBowlDataModule(pl.LightningDataModule):
 
         print(f"Dataset splits: train={train_size}, val={val_size}, test={test_size}")
 
+    def _setup_streaming(self) -> None:
+        """Set up streaming datasets, split by sample index."""
+
+        def streaming_split(split: str) -> BloodBowlIterableDataset:
+            return BloodBowlIterableDataset(
+                self.data_file,
+                split=split,
+                val_split=self.val_split,
+                test_split=self.test_split,
+            )
+
+        self.train_dataset = streaming_split("train")
+        self.val_dataset = streaming_split("val") if self.val_split > 0 else None
+        self.test_dataset = streaming_split("test") if self.test_split > 0 else None
+        print(f"Streaming dataset from {self.data_file}")
+
     def train_dataloader(self) -> DataLoader:
         """Create training DataLoader."""
         return DataLoader(
             self.train_dataset,
             batch_size=self.batch_size,
-            shuffle=True,
+            # Streamed samples come in file order and cannot be shuffled
+            shuffle=not self.streaming,
+            drop_last=self.drop_last,
             num_workers=self.num_workers,
-            pin_memory=True,
-            persistent_workers=self.num_workers > 0,
+            collate_fn=collate_batch,
+            pin_memory=self.pin_memory,
+            persistent_workers=self.persistent_workers and self.num_workers > 0,
+            prefetch_factor=self.prefetch_factor if self.num_workers > 0 else None,
         )
 
     def val_dataloader(self) -> DataLoader | None:
@@ -304,8 +981,10 @@ class BloodBowlDataModule(pl.LightningDataModule):
             batch_size=self.batch_size,
             shuffle=False,
             num_workers=self.num_workers,
-            pin_memory=True,
-            persistent_workers=self.num_workers > 0,
+            collate_fn=collate_batch,
+            pin_memory=self.pin_memory,
+            persistent_workers=self.persistent_workers and self.num_workers > 0,
+            prefetch_factor=self.prefetch_factor if self.num_workers > 0 else None,
         )
 
     def test_dataloader(self) -> DataLoader | None:
@@ -317,6 +996,8 @@ class BloodBowlDataModule(pl.LightningDataModule):
             batch_size=self.batch_size,
             shuffle=False,
             num_workers=self.num_workers,
-            pin_memory=True,
-            persistent_workers=self.num_workers > 0,
+            collate_fn=collate_batch,
+            pin_memory=self.pin_memory,
+            persistent_workers=self.persistent_workers and self.num_workers > 0,
+            prefetch_factor=self.prefetch_factor if self.num_workers > 0 else None,
         )
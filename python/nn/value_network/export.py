@@ -6,11 +6,14 @@ formats including ONNX, TorchScript, PyTorch state dict, and SafeTensors.
 """
 
 import argparse
+import copy
 from enum import Enum
 from pathlib import Path
 from typing import Any
 
 import torch
+import torch.nn as nn
+from torch.nn.utils.fusion import fuse_conv_bn_eval
 
 from nn.value_network.model import ValueNetworkModule
 
@@ -22,14 +25,87 @@ class ExportFormat(str, Enum):
     TORCHSCRIPT = "torchscript"
     PYTORCH = "pytorch"
     SAFETENSORS = "safetensors"
+    SAFETENSORS_INT8 = "safetensors_int8"
     ALL = "all"
 
 
+# onnxoptimizer passes applied to the exported ONNX graph
+ONNX_OPTIMIZER_PASSES = [
+    "eliminate_nop_dropout",
+    "fuse_bn_into_conv",
+    "fuse_add_bias_into_conv",
+    "fuse_consecutive_transposes",
+    "fuse_matmul_add_bias_into_gemm",
+]
+
+
+def prepare_for_export(
+    model: ValueNetworkModule,
+) -> tuple[torch.Tensor, torch.Tensor]:
+    """
+    Put the model in inference mode on CPU and create its example inputs.
+
+    Args:
+        model: The ValueNetworkModule to export.
+
+    Returns:
+        Example (spatial_input, non_spatial_input) batch of one sample, with the
+        (C, W, H) spatial shape and the parameter dtype.
+    """
+    model.eval()
+    model.to("cpu")
+    # No gradient is recorded while tracing or exporting
+    model.requires_grad_(False)
+
+    dtype = next(model.parameters()).dtype
+    dummy_spatial = torch.randn(
+        1,
+        model.num_spatial_layers,
+        model.BOARD_WIDTH,
+        model.BOARD_HEIGHT,
+        dtype=dtype,
+    )
+    dummy_non_spatial = torch.randn(1, model.num_non_spatial_features, dtype=dtype)
+    return dummy_spatial, dummy_non_spatial
+
+
+def _conv_bn_pairs(model: nn.Module) -> list[tuple[nn.Sequential, int]]:
+    """Find each Conv2d directly followed by a BatchNorm2d in a Sequential."""
+    return [
+        (sequential, i)
+        for sequential in model.modules()
+        if isinstance(sequential, nn.Sequential)
+        for i in range(len(sequential) - 1)
+        if isinstance(sequential[i], nn.Conv2d)
+        and isinstance(sequential[i + 1], nn.BatchNorm2d)
+    ]
+
+
+def fuse_for_inference(model: ValueNetworkModule) -> ValueNetworkModule:
+    """
+    Fold the batch norms that follow a convolution into the convolution weights.
+
+    The model must be in eval mode. It is not modified: when there is something to
+    fuse, a fused copy is returned, so later state dict exports keep the original
+    layers. The current architecture has no batch norm, so the model itself is
+    returned.
+    """
+    if not _conv_bn_pairs(model):
+        return model
+
+    fused = copy.deepcopy(model)
+    for sequential, i in _conv_bn_pairs(fused):
+        sequential[i] = fuse_conv_bn_eval(sequential[i], sequential[i + 1])
+        sequential[i + 1] = nn.Identity()
+    return fused
+
+
 def export_to_onnx(
     model: ValueNetworkModule,
     output_path: Path,
     opset_version: int = 17,
     dynamic_batch: bool = True,
+    exporter: str = "torchscript",
 ) -> Path:
     """
     Export model to ONNX format.
@@ -39,30 +115,25 @@ def export_to_onnx(
         output_path: Path for the output .onnx file.
         opset_version: ONNX opset version to use.
         dynamic_batch: Whether to use dynamic batch size.
+        exporter: ONNX exporter - 'torchscript' for the tracing exporter or
+            'dynamo' for the TorchDynamo based one, which falls back to tracing
+            when the model cannot be captured.
 
     Returns:
         Path to the exported ONNX model.
     """
-    print(f"Exporting to ONNX format (opset {opset_version})...")
+    if exporter not in ("torchscript", "dynamo"):
+        raise ValueError(
+            f"Unknown exporter: {exporter}. Use 'torchscript' or 'dynamo'."
+        )
 
-    model.eval()
-    model.to("cpu")
+    print(f"Exporting to ONNX format (opset {opset_version}, exporter: {exporter})...")
 
-    # Create dummy inputs with correct shapes (C, W, H)
-    dummy_spatial = torch.randn(
-        1,
-        model.num_spatial_layers,
-        model.BOARD_WIDTH,
-        model.BOARD_HEIGHT,
-        device="cpu",
-    )
-    dummy_non_spatial = torch.randn(
-        1,
-        model.num_non_spatial_features,
-        device="cpu",
-    )
+    dummy_spatial, dummy_non_spatial = prepare_for_export(model)
+    model = fuse_for_inference(model)
 
-    # Configure dynamic axes
+    # Only the batch axis may be dynamic. The board dimensions never change, so the
+    # spatial axes stay fixed to the example input and shapes can be constant folded
     dynamic_axes: dict[str, dict[int, str]] | None = None
     if dynamic_batch:
         dynamic_axes = {
@@ -73,25 +144,89 @@ def export_to_onnx(
 
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    torch.onnx.export(
-        model,
-        (dummy_spatial, dummy_non_spatial),
-        str(output_path),
+    export_args = dict(
+        model=model,
+        args=(dummy_spatial, dummy_non_spatial),
+        f=str(output_path),
         input_names=["spatial_input", "non_spatial_input"],
         output_names=["output"],
         dynamic_axes=dynamic_axes,
         opset_version=opset_version,
-        do_constant_folding=True,
     )
 
+    with torch.no_grad():
+        exported = False
+        if exporter == "dynamo":
+            try:
+                torch.onnx.export(**export_args, dynamo=True)
+                exported = True
+            except Exception as e:
+                print(f"Dynamo export failed, falling back to tracing: {e}")
+        if not exported:
+            torch.onnx.export(
+                **export_args,
+                dynamo=False,
+                do_constant_folding=True,
+                keep_initializers_as_inputs=False,
+            )
+    optimize_onnx(output_path)
+
     print(f"ONNX model saved to: {output_path}")
     return output_path
 
 
+def optimize_onnx(model_path: Path) -> None:
+    """
+    Optimize an exported ONNX model in place.
+
+    The onnxoptimizer fusion passes are run when onnxoptimizer is installed, and
+    the shapes of all intermediate values are inferred and stored in the graph.
+    When onnxruntime is installed, the graph it optimizes with all optimizations
+    enabled is also saved next to the model as `<name>.opt.onnx`. That copy may
+    use onnxruntime specific operators, so the portable model is kept as the
+    main export.
+
+    Args:
+        model_path: Path of the .onnx file to optimize.
+    """
+    try:
+        import onnx
+    except ImportError:
+        print("onnx not installed, skipping ONNX graph optimization")
+        return
+
+    onnx_model = onnx.load(str(model_path))
+    try:
+        import onnxoptimizer
+    except ImportError:
+        print("onnxoptimizer not installed, skipping ONNX fusion passes")
+    else:
+        onnx_model = onnxoptimizer.optimize(onnx_model, ONNX_OPTIMIZER_PASSES)
+    onnx_model = onnx.shape_inference.infer_shapes(onnx_model)
+    onnx.save(onnx_model, str(model_path))
+
+    try:
+        import onnxruntime as ort
+    except ImportError:
+        return
+
+    optimized_path = model_path.with_suffix(".opt.onnx")
+    sess_options = ort.SessionOptions()
+    sess_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    sess_options.optimized_model_filepath = str(optimized_path)
+    # Creating the session runs the optimizations and saves the optimized graph
+    ort.InferenceSession(
+        str(model_path), sess_options, providers=["CPUExecutionProvider"]
+    )
+    print(f"onnxruntime optimized model saved to: {optimized_path}")
+
+
 def export_to_torchscript(
     model: ValueNetworkModule,
     output_path: Path,
-    method: str = "trace",
+    method: str = "script",
+    optimize: bool = True,
+    lite: bool = True,
 ) -> Path:
     """
     Export model to TorchScript format.
@@ -99,41 +234,62 @@ def export_to_torchscript(
     Args:
         model: The ValueNetworkModule to export.
         output_path: Path for the output .pt file.
-        method: Export method - 'trace' or 'script'.
+        method: Export method - 'script' or 'trace'. Falls back to tracing when
+            the model cannot be scripted.
+        optimize: Freeze the module and run torch.jit.optimize_for_inference,
+            which folds the weights into the graph as constants and fuses ops
+            for CPU inference.
+        lite: Also save the module for the lite interpreter as a .ptl file next to
+            output_path, which is smaller and faster to load.
 
     Returns:
         Path to the exported TorchScript model.
     """
     print(f"Exporting to TorchScript format (method: {method})...")
 
-    model.eval()
-    model.to("cpu")
-
-    # Create dummy inputs for tracing
-    dummy_spatial = torch.randn(
-        1,
-        model.num_spatial_layers,
-        model.BOARD_HEIGHT,
-        model.BOARD_WIDTH,
-        device="cpu",
-    )
-    dummy_non_spatial = torch.randn(
-        1,
-        model.num_non_spatial_features,
-        device="cpu",
-    )
+    dummy_spatial, dummy_non_spatial = prepare_for_export(model)
+    model = fuse_for_inference(model)
 
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    if method == "trace":
-        scripted_model = torch.jit.trace(model, (dummy_spatial, dummy_non_spatial))
-    elif method == "script":
-        scripted_model = torch.jit.script(model)
-    else:
+    if method not in ("trace", "script"):
         raise ValueError(f"Unknown method: {method}. Use 'trace' or 'script'.")
 
+    scripted_model = None
+    if method == "script":
+        try:
+            scripted_model = torch.jit.script(model)
+        except Exception as e:
+            print(f"Scripting failed, falling back to tracing: {e}")
+    if scripted_model is None:
+        with torch.no_grad():
+            scripted_model = torch.jit.trace(model, (dummy_spatial, dummy_non_spatial))
+
+    if optimize:
+        scripted_model = torch.jit.optimize_for_inference(
+            torch.jit.freeze(scripted_model.eval())
+        )
+
+    # The exported module must compute the same values as the eager one
+    with torch.no_grad():
+        torch.testing.assert_close(
+            scripted_model(dummy_spatial, dummy_non_spatial),
+            model(dummy_spatial, dummy_non_spatial),
+            rtol=1e-4,
+            atol=1e-5,
+        )
+
     scripted_model.save(str(output_path))
 
+    if lite:
+        lite_path = output_path.with_suffix(".ptl")
+        try:
+            scripted_model._save_for_lite_interpreter(str(lite_path))
+            print(f"TorchScript lite model saved to: {lite_path}")
+        except RuntimeError as e:
+            # Some ops fused for the full interpreter have no lite implementation
+            print(f"Skipping TorchScript lite model: {e}")
+
     print(f"TorchScript model saved to: {output_path}")
     return output_path
 
@@ -219,13 +375,75 @@ def export_to_safetensors(
     return output_path
 
 
+def export_to_safetensors_int8(
+    model: ValueNetworkModule,
+    output_path: Path,
+) -> Path:
+    """
+    Export model to SafeTensors format with int8 weights for Candle/Rust inference.
+
+    The weight of every Conv2d and Linear layer is quantized symmetrically per
+    output channel and stored as two tensors: `<name>.int8` with the int8 values
+    and `<name>.scale` with the float32 scale of each output channel, so that
+    weight = int8 * scale. Biases are stored unchanged in float32.
+
+    Args:
+        model: The ValueNetworkModule to export.
+        output_path: Path for the output .safetensors file.
+
+    Returns:
+        Path to the exported SafeTensors model.
+    """
+    try:
+        from safetensors.torch import save_file
+    except ImportError:
+        raise ImportError(
+            "safetensors package is required for SafeTensors export. "
+            "Install with: pip install safetensors"
+        )
+
+    print("Exporting to SafeTensors int8 format...")
+
+    model.eval()
+    model.to("cpu")
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    quantized = {
+        f"{name}.weight"
+        for name, module in model.named_modules()
+        if isinstance(module, (nn.Conv2d, nn.Linear))
+    }
+
+    tensors = {}
+    for name, tensor in model.state_dict().items():
+        if name not in quantized:
+            tensors[name] = tensor.contiguous()
+            continue
+
+        # Largest magnitude of each output channel maps to 127
+        max_abs = tensor.abs().amax(dim=tuple(range(1, tensor.dim())))
+        scale = (max_abs / 127).clamp(min=torch.finfo(torch.float32).tiny)
+        channel_scale = scale.view(-1, *([1] * (tensor.dim() - 1)))
+        tensors[f"{name}.int8"] = (
+            torch.round(tensor / channel_scale).clamp(-127, 127).to(torch.int8)
+        )
+        tensors[f"{name}.scale"] = scale.contiguous()
+
+    save_file(tensors, str(output_path))
+
+    print(f"SafeTensors int8 model saved to: {output_path}")
+    return output_path
+
+
 def export_model(
     checkpoint_path: Path,
     output_dir: Path,
     formats: list[ExportFormat],
     model_name: str = "blood_bowl_value_net",
     onnx_opset: int = 17,
-    torchscript_method: str = "trace",
+    onnx_exporter: str = "torchscript",
+    torchscript_method: str = "script",
 ) -> dict[ExportFormat, Path]:
     """
     Export a model from a Lightning checkpoint to specified formats.
@@ -236,6 +454,7 @@ def export_model(
         formats: List of export formats.
         model_name: Base name for exported files.
         onnx_opset: ONNX opset version.
+        onnx_exporter: ONNX exporter, 'torchscript' or 'dynamo'.
         torchscript_method: TorchScript export method.
 
     Returns:
@@ -252,6 +471,7 @@ def export_model(
             ExportFormat.TORCHSCRIPT,
             ExportFormat.PYTORCH,
             ExportFormat.SAFETENSORS,
+            ExportFormat.SAFETENSORS_INT8,
         ]
 
     output_dir.mkdir(parents=True, exist_ok=True)
@@ -260,7 +480,9 @@ def export_model(
     for fmt in formats:
         if fmt == ExportFormat.ONNX:
             output_path = output_dir / f"{model_name}.onnx"
-            export_to_onnx(model, output_path, opset_version=onnx_opset)
+            export_to_onnx(
+                model, output_path, opset_version=onnx_opset, exporter=onnx_exporter
+            )
             exported[fmt] = output_path
 
         elif fmt == ExportFormat.TORCHSCRIPT:
@@ -278,6 +500,11 @@ def export_model(
             export_to_safetensors(model, output_path)
             exported[fmt] = output_path
 
+        elif fmt == ExportFormat.SAFETENSORS_INT8:
+            output_path = output_dir / f"{model_name}.int8.safetensors"
+            export_to_safetensors_int8(model, output_path)
+            exported[fmt] = output_path
+
     return exported
 
 
@@ -313,7 +540,7 @@ def parse_args() -> argparse.Namespace:
         type=str,
         nargs="+",
         default=["all"],
-        choices=["onnx", "torchscript", "pytorch", "safetensors", "all"],
+        choices=[fmt.value for fmt in ExportFormat],
         help="Export format(s)",
     )
 
@@ -324,10 +551,18 @@ def parse_args() -> argparse.Namespace:
         help="ONNX opset version",
     )
 
+    parser.add_argument(
+        "--onnx-exporter",
+        type=str,
+        default="torchscript",
+        choices=["torchscript", "dynamo"],
+        help="ONNX exporter (dynamo falls back to torchscript on failure)",
+    )
+
     parser.add_argument(
         "--torchscript-method",
         type=str,
-        default="trace",
+        default="script",
         choices=["trace", "script"],
         help="TorchScript export method",
     )
@@ -360,6 +595,7 @@ def main() -> None:
         formats=formats,
         model_name=args.model_name,
         onnx_opset=args.onnx_opset,
+        onnx_exporter=args.onnx_exporter,
         torchscript_method=args.torchscript_method,
     )
 
@@ -1,17 +1,99 @@
 import argparse
+import copy
 import logging
+import multiprocessing
+import os
 from pathlib import Path
-from typing import cast
+from typing import Any, cast
 
 import botbowl
 from botbowl import Game, register_bot
 from bots import MyScriptedBot
 from yasa.components import GameStateSerializer
 
+# Game setup shared by the games of a process, set by init_worker
+worker_context: dict[str, Any] = {}
 
-def main(num_games: int, data_dir: str, parallel_index: int):
+
+def init_worker(
+    config: Any,
+    ruleset: Any,
+    arena: Any,
+    team: Any,
+    data_dir: Path,
+    num_games: int,
+    parallel_index: int,
+) -> None:
+    """
+    Keep the game setup loaded once by main for the games of this process.
+    """
+    worker_context.update(
+        config=config,
+        ruleset=ruleset,
+        arena=arena,
+        team=team,
+        data_dir=data_dir,
+        num_games=num_games,
+        parallel_index=parallel_index,
+    )
+
+
+def run_one_game(i: int) -> bool:
+    """
+    Play one game between two Scripted Bot instances and save its states.
+
+    Returns:
+        Whether the game finished without error.
+    """
+    config = worker_context["config"]
+    ruleset = worker_context["ruleset"]
+    num_games = worker_context["num_games"]
+    parallel_index = worker_context["parallel_index"]
+    logging.info(f"--- Starting Game {i + 1}/{num_games} on {parallel_index}---")
+
+    # Teams change during a game, so each game plays fresh copies of the template
+    home_team = copy.deepcopy(worker_context["team"])
+    away_team = copy.deepcopy(worker_context["team"])
+
+    home_agent = cast(MyScriptedBot, botbowl.make_bot("MyScriptedBot"))
+    away_agent = cast(MyScriptedBot, botbowl.make_bot("MyScriptedBot"))
+
+    game = Game(
+        str(i),
+        home_team,
+        away_team,
+        home_agent,
+        away_agent,
+        config,
+        arena=worker_context["arena"],
+        ruleset=ruleset,
+        save_state_path=str(worker_context["data_dir"]),
+        save_state_serializer=GameStateSerializer,
+    )
+    game.config.fast_mode = True
+
+    try:
+        game.init()
+        logging.info(f"Game {i + 1} finished successfully.")
+        logging.info(
+            f"  Result: Home {game.state.home_team.state.score} - Away {game.state.away_team.state.score}"
+        )
+    except Exception as e:
+        logging.warning(f"Game {i + 1} failed with error: {e}")
+        # error_log_path = f"generate_data_error_state_{i}.json"
+        # with open(error_log_path, "w") as f:
+        #     json.dump(GameStateSerializer.to_json(game.state), f)
+        # logging.warning(f"  Error state saved to {error_log_path}")
+        return False
+    return True
+
+
+def main(num_games: int, data_dir: str, parallel_index: int, workers: int = 1):
     """
     Runs a series of games between two Scripted Bot instances to generate training data.
+
+    The games are played by `workers` processes, which share the config, ruleset,
+    arena and team loaded once here.
     """
     data_dir = Path(data_dir) / "games" / f"p_{parallel_index}"
     data_dir.mkdir(parents=True, exist_ok=True)
@@ -25,45 +107,27 @@ def main(num_games: int, data_dir: str, parallel_index: int):
     config.debug_mode = False
     ruleset = botbowl.load_rule_set(config.ruleset)
     arena = botbowl.load_arena(config.arena)
+    team = botbowl.load_team_by_filename("human", ruleset)
+    setup = (config, ruleset, arena, team, data_dir, num_games, parallel_index)
 
     # --- Game Loop ---
-    for i in range(num_games):
-        logging.info(f"--- Starting Game {i + 1}/{num_games} on {parallel_index}---")
-
-        home_team = botbowl.load_team_by_filename("human", ruleset)
-        away_team = botbowl.load_team_by_filename("human", ruleset)
-
-        home_agent = cast(MyScriptedBot, botbowl.make_bot("MyScriptedBot"))
-        away_agent = cast(MyScriptedBot, botbowl.make_bot("MyScriptedBot"))
-
-        game = Game(
-            str(i),
-            home_team,
-            away_team,
-            home_agent,
-            away_agent,
-            config,
-            arena=arena,
-            ruleset=ruleset,
-            save_state_path=str(data_dir),
-            save_state_serializer=GameStateSerializer,
-        )
-        game.config.fast_mode = True
-
-        try:
-            game.init()
-            logging.info(f"Game {i + 1} finished successfully.")
-            logging.info(
-                f"  Result: Home {game.state.home_team.state.score} - Away {game.state.away_team.state.score}"
-            )
-        except Exception as e:
-            logging.warning(f"Game {i + 1} failed with error: {e}")
-            # error_log_path = f"generate_data_error_state_{i}.json"
-            # with open(error_log_path, "w") as f:
-            #     json.dump(GameStateSerializer.to_json(game.state), f)
-            # logging.warning(f"  Error state saved to {error_log_path}")
-            continue  # Continue to the next game
-    logging.info(f"--- Data generation complete on {parallel_index} ---")
+    if workers > 1:
+        # Forked workers inherit the loaded setup and the registered bot, so they
+        # do not need to be picklable
+        if "fork" in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context("fork")
+        else:
+            context = multiprocessing.get_context()
+        with context.Pool(workers, initializer=init_worker, initargs=setup) as pool:
+            results = list(pool.imap_unordered(run_one_game, range(num_games)))
+    else:
+        init_worker(*setup)
+        results = [run_one_game(i) for i in range(num_games)]
+
+    logging.info(
+        f"--- Data generation complete on {parallel_index}: "
+        f"{sum(results)}/{num_games} games finished ---"
+    )
 
 
 if __name__ == "__main__":
@@ -89,7 +153,14 @@ if __name__ == "__main__":
         default=0,
         help="Parallel index to handle running script using parallel index",
     )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of processes playing games",
+    )
     args = parser.parse_args()
     logger = logging.getLogger()
     logger.setLevel(logging.INFO)
-    main(args.num_games, args.data_dir, args.parallel_index)
+    main(args.num_games, args.data_dir, args.parallel_index, args.workers)
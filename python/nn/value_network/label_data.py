@@ -1,27 +1,114 @@
 import argparse
 import json
-import math
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+import numpy as np
 
-def exponential_weights(n: int, label: int, k: int = 2) -> list[float]:
+# orjson parses and serializes the states several times faster; it is optional
+try:
+    from orjson import dumps as dumps_json
+    from orjson import loads as loads_json
+
+    HAS_ORJSON = True
+except ImportError:
+    from json import loads as loads_json
+
+    HAS_ORJSON = False
+
+    def dumps_json(obj: dict) -> bytes:
+        return json.dumps(obj).encode()
+
+
+# ijson reads only the fields needed to group states into runs; it is optional
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# ijson prefixes of the fields read by read_meta
+META_PREFIXES = ("half", "home_team.score", "away_team.score")
+
+
+def exponential_weights(n: int, label: int, k: int = 2) -> np.ndarray:
     """
     Generate n exponentially increasing weights that end exactly at 1.
     `k` controls how fast the curve approaches 0 at the start.
     """
-    return [label * math.exp(k * (i - (n - 1)) / (n - 1)) for i in range(n)]
+    return label * np.exp(k * (np.arange(n) - (n - 1)) / (n - 1))
+
+
+def load_state(game_file: str) -> dict:
+    """
+    Parse a game state file.
+
+    With orjson, files larger than a page are memory-mapped and parsed in place
+    instead of being read into a bytes object first.
+    """
+    with open(game_file, "rb") as f:
+        if HAS_ORJSON and os.fstat(f.fileno()).st_size >= mmap.PAGESIZE:
+            with (
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped,
+                memoryview(mapped) as view,
+            ):
+                return loads_json(view)
+        return loads_json(f.read())
 
 
-def label_run(scores: list[float], states: list[Path]) -> list[dict]:
+def label_run(scores: np.ndarray, states: list[str]) -> list[dict]:
     labeled_states = []
-    for score, state in zip(scores, states):
-        state = json.loads(state.read_text())
+    # Python floats, which the JSON serializers accept
+    for score, state in zip(scores.tolist(), states):
+        state = load_state(state)
         state["score"] = score
         labeled_states.append(state)
     return labeled_states
 
 
-def group_game_to_runs(game_dir: Path) -> list[tuple[list[Path], int]]:
+def read_meta(game_file: str) -> tuple[int, tuple[int, int]]:
+    """
+    Read the half and the (home, away) score of a game state file.
+
+    With ijson, the file is scanned as a stream of events up to the last of these
+    fields, without building the rest of the state. Otherwise the whole state is
+    parsed.
+    """
+    if ijson is None:
+        data = load_state(game_file)
+        return data["half"], (data["home_team"]["score"], data["away_team"]["score"])
+
+    values = {}
+    with open(game_file, "rb") as f:
+        for prefix, event, value in ijson.parse(f):
+            if event == "number" and prefix in META_PREFIXES:
+                values[prefix] = value
+                if len(values) == len(META_PREFIXES):
+                    break
+    return values["half"], (values["home_team.score"], values["away_team.score"])
+
+
+def list_game_files(game_dir: Path) -> list[str]:
+    """
+    List the state files of a game in order, with a single directory scan.
+
+    States are numbered from 0.json; the list stops at the first missing number.
+    """
+    numbered = sorted(
+        (int(entry.name[:-5]), entry.path)
+        for entry in os.scandir(game_dir)
+        if entry.name.endswith(".json") and entry.name[:-5].isdigit()
+    )
+    game_files = []
+    for expected, (number, path) in enumerate(numbered):
+        if number != expected:
+            break
+        game_files.append(path)
+    return game_files
+
+
+def group_game_to_runs(game_dir: Path) -> list[tuple[list[str], int]]:
     """
     Group game states into runs (drives) and label them.
 
@@ -42,24 +129,19 @@ def group_game_to_runs(game_dir: Path) -> list[tuple[list[Path], int]]:
         List of (files_in_run, label) tuples
     """
     groups = []
-    i = 0
     prev_half = None
     prev_score = None
     files_in_current_run = []
 
-    game_file = game_dir / f"{i}.json"
-    while game_file.exists():
-        data = json.loads(game_file.read_text())
-        current_half = data["half"]
-        current_score = (data["home_team"]["score"], data["away_team"]["score"])
+    for game_file in list_game_files(game_dir):
+        # Only the fields deciding the run boundaries; label_run parses the states
+        current_half, current_score = read_meta(game_file)
 
         # First file in the game
         if prev_half is None:
             prev_half = current_half
             prev_score = current_score
             files_in_current_run.append(game_file)
-            i += 1
-            game_file = game_dir / f"{i}.json"
             continue
 
         # Check for boundaries
@@ -94,9 +176,6 @@ def group_game_to_runs(game_dir: Path) -> list[tuple[list[Path], int]]:
             # Continue current run
             files_in_current_run.append(game_file)
 
-        i += 1
-        game_file = game_dir / f"{i}.json"
-
     # Handle the last run (game ended)
     if files_in_current_run:
         groups.append((files_in_current_run, 0))
@@ -104,36 +183,71 @@ def group_game_to_runs(game_dir: Path) -> list[tuple[list[Path], int]]:
     return groups
 
 
-def main(data_dir: str | Path, cleanup: bool = True):
+def process_game(game_dir: Path) -> tuple[bytearray, int, int]:
+    """
+    Label the runs of a game that end with a touchdown.
+
+    Returns:
+        The labeled states as one buffer of JSON lines, the number of states and
+        the number of runs kept.
+    """
+    lines = bytearray()
+    sample_counter = 0
+    run_counter = 0
+    for files, label in group_game_to_runs(game_dir):
+        if label == 0 or len(files) == 1:
+            continue
+        scores = exponential_weights(len(files), label)
+        for state in label_run(scores, files):
+            lines += dumps_json(state)
+            lines += b"\n"
+        sample_counter += len(files)
+        run_counter += 1
+    return lines, sample_counter, run_counter
+
+
+def main(
+    data_dir: str | Path,
+    cleanup: bool = True,
+    workers: int | None = None,
+    parquet: bool = False,
+):
     data_dir = Path(data_dir)
     output_dir = data_dir.parent
     merged_path = output_dir / "merged.jsonl"
     run_counter = 0
     sample_counter = 0
 
-    with merged_path.open("w") as f:
-        for process_dir in data_dir.iterdir():
-            if not process_dir.is_dir():
-                continue
-            for game_dir in process_dir.iterdir():
-                if not game_dir.is_dir():
-                    continue
-                print(f"Labeling: {game_dir}")
-                runs = group_game_to_runs(game_dir)
-                for run in runs:
-                    if run[1] == 0 or len(run[0]) == 1:
-                        continue
-                    scores = exponential_weights(len(run[0]), run[1])
-                    labeled_states = label_run(scores, run[0])
-                    for state in labeled_states:
-                        f.write(json.dumps(state))
-                        f.write("\n")
-                        sample_counter += 1
-                    run_counter += 1
+    game_dirs = [
+        game_dir
+        for process_dir in data_dir.iterdir()
+        if process_dir.is_dir()
+        for game_dir in process_dir.iterdir()
+        if game_dir.is_dir()
+    ]
+
+    # Games are labeled in parallel and written in order by this process
+    with (
+        merged_path.open("wb", buffering=1 << 20) as f,
+        ProcessPoolExecutor(max_workers=workers) as executor,
+    ):
+        results = executor.map(process_game, game_dirs, chunksize=8)
+        for game_dir, (lines, samples, runs) in zip(game_dirs, results):
+            print(f"Labeled: {game_dir}")
+            # One write per game
+            f.write(lines)
+            sample_counter += samples
+            run_counter += runs
 
     print(f"Processed {run_counter} runs with {sample_counter} samples")
     print(f"Output written to: {merged_path}")
 
+    # Parsed once here, so training reads tensors instead of JSON
+    if parquet:
+        from nn.value_network.convert_data import main as convert_data
+
+        convert_data(merged_path)
+
     # Clean up intermediate game files
     if cleanup:
         import shutil
@@ -157,5 +271,22 @@ if __name__ == "__main__":
         action="store_true",
         help="Remove intermediate game files after processing",
     )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of labeling processes (all CPUs by default)",
+    )
+    parser.add_argument(
+        "--parquet",
+        action="store_true",
+        help="Also convert merged.jsonl to merged.parquet for training",
+    )
     args = parser.parse_args()
-    main(args.data_dir, cleanup=args.cleanup)
+    main(
+        args.data_dir,
+        cleanup=args.cleanup,
+        workers=args.workers,
+        parquet=args.parquet,
+    )
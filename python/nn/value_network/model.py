@@ -11,6 +11,9 @@ import pytorch_lightning as pl
 import torch
 import torch.nn as nn
 
+# AdamW implementations selectable for training
+OPTIMIZERS = ("adamw", "adamw-fused", "adamw-8bit")
+
 
 class ValueNetworkModule(pl.LightningModule):
     """
@@ -49,6 +52,7 @@ class ValueNetworkModule(pl.LightningModule):
         lr_scheduler_patience: int = 5,
         lr_scheduler_factor: float = 0.5,
         lr_scheduler_min_lr: float = 1e-7,
+        optimizer: str = "adamw",
     ):
         """
         Initialize the ValueNetworkModule.
@@ -61,7 +65,14 @@ class ValueNetworkModule(pl.LightningModule):
             lr_scheduler_patience: Epochs with no improvement before reducing LR.
             lr_scheduler_factor: Factor by which to reduce LR.
             lr_scheduler_min_lr: Minimum learning rate.
+            optimizer: AdamW implementation, one of OPTIMIZERS. "adamw-fused" runs
+                the update of all parameters in a single kernel and "adamw-8bit"
+                keeps the moments in 8 bits using bitsandbytes.
         """
+        if optimizer not in OPTIMIZERS:
+            raise ValueError(
+                f"Unknown optimizer: {optimizer}. Choose from {', '.join(OPTIMIZERS)}"
+            )
         super().__init__()
         self.save_hyperparameters()
 
@@ -73,6 +84,7 @@ class ValueNetworkModule(pl.LightningModule):
         self.lr_scheduler_patience = lr_scheduler_patience
         self.lr_scheduler_factor = lr_scheduler_factor
         self.lr_scheduler_min_lr = lr_scheduler_min_lr
+        self.optimizer = optimizer
 
         # Build network architecture
         self._build_network()
@@ -106,9 +118,6 @@ class ValueNetworkModule(pl.LightningModule):
             nn.ReLU(inplace=True),
         )
 
-        # Global average pooling reduces (32, W, H) -> (32,)
-        self.global_pool = nn.AdaptiveAvgPool2d(1)
-
         # FC head: spatial features (32) + non-spatial (15) -> output
         fc_input_size = 32 + self.num_non_spatial_features
         self.fc_head = nn.Sequential(
@@ -124,7 +133,8 @@ class ValueNetworkModule(pl.LightningModule):
         Perform the forward pass through the network.
 
         Args:
-            spatial_input: Tensor of shape (N, C, W, H) representing spatial layers.
+            spatial_input: Tensor of shape (N, C, W, H) representing spatial layers,
+                          either float or the uint8 layers of the dataset.
                           C = num_spatial_layers, W = BOARD_WIDTH, H = BOARD_HEIGHT.
             non_spatial_input: Tensor of shape (N, F) representing non-spatial features.
                               F = num_non_spatial_features.
@@ -132,11 +142,14 @@ class ValueNetworkModule(pl.LightningModule):
         Returns:
             Tensor of shape (N, 1) with a single value score in [-1, 1].
         """
+        # The dataset stores the board as uint8; cast on device
+        spatial_input = spatial_input.float()
+
         # Process spatial features
         x = self.spatial_reduce(spatial_input)  # (N, 16, W, H)
         x = self.spatial_conv(x)  # (N, 32, W, H)
-        x = self.global_pool(x)  # (N, 32, 1, 1)
-        x = x.view(x.size(0), -1)  # (N, 32)
+        # Global average pooling as a plain mean, exported as a single ReduceMean
+        x = x.mean(dim=(2, 3))  # (N, 32)
 
         # Concatenate with non-spatial features
         combined = torch.cat([x, non_spatial_input], dim=1)  # (N, 47)
@@ -205,11 +218,26 @@ class ValueNetworkModule(pl.LightningModule):
 
     def configure_optimizers(self) -> dict[str, Any]:
         """Configure optimizer and learning rate scheduler."""
-        optimizer = torch.optim.AdamW(
-            self.parameters(),
-            lr=self.learning_rate,
-            weight_decay=self.weight_decay,
-        )
+        if self.optimizer == "adamw-8bit":
+            try:
+                import bitsandbytes as bnb
+            except ImportError:
+                raise ImportError(
+                    "bitsandbytes is required for the adamw-8bit optimizer. "
+                    "Install it with: pip install bitsandbytes"
+                )
+            optimizer = bnb.optim.AdamW8bit(
+                self.parameters(),
+                lr=self.learning_rate,
+                weight_decay=self.weight_decay,
+            )
+        else:
+            optimizer = torch.optim.AdamW(
+                self.parameters(),
+                lr=self.learning_rate,
+                weight_decay=self.weight_decay,
+                fused=self.optimizer == "adamw-fused",
+            )
         scheduler = torch.optim.lr_scheduler.ReduceLROnPlateau(
             optimizer,
             mode="min",
@@ -271,5 +299,37 @@ class ValueNetworkModule(pl.LightningModule):
 
         Returns:
             Tensor of shape (N, 1) with value in [-1, 1].
+
+        Raises:
+            ValueError: If the inputs do not have the fixed board and feature shapes.
         """
+        self.check_input_shapes(spatial_input, non_spatial_input)
         return self(spatial_input, non_spatial_input)
+
+    def check_input_shapes(
+        self, spatial_input: torch.Tensor, non_spatial_input: torch.Tensor
+    ) -> None:
+        """
+        Check the inputs against the fixed shapes the exported graphs assume.
+
+        Only the batch size may vary; the board is always (C, W, H) with
+        W = BOARD_WIDTH and H = BOARD_HEIGHT.
+
+        Raises:
+            ValueError: If an input has another shape.
+        """
+        spatial_shape = (self.num_spatial_layers, self.BOARD_WIDTH, self.BOARD_HEIGHT)
+        if spatial_input.dim() != 4 or tuple(spatial_input.shape[1:]) != spatial_shape:
+            raise ValueError(
+                f"Expected spatial input of shape (N, {self.num_spatial_layers}, "
+                f"{self.BOARD_WIDTH}, {self.BOARD_HEIGHT}), "
+                f"got {tuple(spatial_input.shape)}"
+            )
+        if non_spatial_input.dim() != 2 or (
+            non_spatial_input.shape[1] != self.num_non_spatial_features
+        ):
+            raise ValueError(
+                f"Expected non-spatial input of shape "
+                f"(N, {self.num_non_spatial_features}), "
+                f"got {tuple(non_spatial_input.shape)}"
+            )
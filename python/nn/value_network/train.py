@@ -22,8 +22,8 @@ from pytorch_lightning.loggers import TensorBoardLogger
 
 sys.path.append("/app/python")
 
-from nn.value_network.dataset import BloodBowlDataModule
-from nn.value_network.model import ValueNetworkModule
+from nn.value_network.dataset import DEFAULT_NUM_WORKERS, BloodBowlDataModule
+from nn.value_network.model import OPTIMIZERS, ValueNetworkModule
 
 
 def parse_args() -> argparse.Namespace:
@@ -39,7 +39,23 @@ def parse_args() -> argparse.Namespace:
         "--data-dir",
         type=str,
         default="data",
-        help="Directory containing .jsonl log files",
+        help="Directory containing merged.jsonl or merged.parquet",
+    )
+    data_group.add_argument(
+        "--cache-dir",
+        type=str,
+        default=None,
+        help="Directory of the parsed tensor cache, built from JSONL on first use",
+    )
+    data_group.add_argument(
+        "--preparse",
+        action="store_true",
+        help="Parse the whole JSONL dataset once and keep it in memory as tensors",
+    )
+    data_group.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Stream samples from the dataset file, for datasets larger than memory",
     )
     data_group.add_argument(
         "--batch-size",
@@ -62,9 +78,27 @@ def parse_args() -> argparse.Namespace:
     data_group.add_argument(
         "--num-workers",
         type=int,
-        default=0,
+        default=DEFAULT_NUM_WORKERS,
         help="Number of data loader workers",
     )
+    data_group.add_argument(
+        "--prefetch-factor",
+        type=int,
+        default=4,
+        help="Batches loaded in advance by each data loader worker",
+    )
+    data_group.add_argument(
+        "--pin-memory",
+        action=argparse.BooleanOptionalAction,
+        default=torch.cuda.is_available(),
+        help="Load batches into pinned memory for asynchronous GPU copies",
+    )
+    data_group.add_argument(
+        "--persistent-workers",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Keep data loader workers alive between epochs",
+    )
 
     # Model arguments
     model_group = parser.add_argument_group("Model")
@@ -81,6 +115,13 @@ def parse_args() -> argparse.Namespace:
         default=1e-5,
         help="Weight decay (L2 regularization)",
     )
+    model_group.add_argument(
+        "--optimizer",
+        type=str,
+        default="adamw",
+        choices=OPTIMIZERS,
+        help="AdamW implementation (adamw-8bit requires bitsandbytes)",
+    )
     model_group.add_argument(
         "--lr-patience",
         type=int,
@@ -123,9 +164,12 @@ def parse_args() -> argparse.Namespace:
     training_group.add_argument(
         "--precision",
         type=str,
-        default="32",
+        default=None,
         choices=["16-mixed", "bf16-mixed", "32"],
-        help="Training precision",
+        help=(
+            "Training precision. When unset, bf16-mixed on GPUs with compute"
+            " capability 8.0 or newer (Ampere+), otherwise 32"
+        ),
     )
 
     # Matmul precision for float32 on Tensor Cores
@@ -140,6 +184,36 @@ def parse_args() -> argparse.Namespace:
         ),
     )
 
+    training_group.add_argument(
+        "--benchmark",
+        action="store_true",
+        help=(
+            "Let cuDNN benchmark and pick the fastest convolution algorithms for the"
+            " fixed board shape. Training is then no longer deterministic"
+        ),
+    )
+    training_group.add_argument(
+        "--compile",
+        action="store_true",
+        help="Compile the model with torch.compile",
+    )
+    training_group.add_argument(
+        "--compile-mode",
+        type=str,
+        default="reduce-overhead",
+        choices=["default", "reduce-overhead", "max-autotune"],
+        help="torch.compile mode used with --compile",
+    )
+
+    training_group.add_argument(
+        "--cuda-graphs",
+        action="store_true",
+        help=(
+            "Replay training steps as CUDA graphs: compiles the model in"
+            " reduce-overhead mode and drops the last incomplete training batch"
+        ),
+    )
+
     # Output arguments
     output_group = parser.add_argument_group("Output")
     output_group.add_argument(
@@ -160,6 +234,12 @@ def parse_args() -> argparse.Namespace:
         default=3,
         help="Number of best checkpoints to keep",
     )
+    output_group.add_argument(
+        "--log-every-n-steps",
+        type=int,
+        default=50,
+        help="Training steps between step-level log writes",
+    )
 
     # Reproducibility
     parser.add_argument(
@@ -180,6 +260,37 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
+def default_precision() -> str:
+    """
+    Pick the training precision for the available hardware.
+
+    bf16 runs on the Tensor Cores of Ampere and newer GPUs and, unlike fp16, needs
+    no gradient scaling. Older GPUs emulate it, so they keep full precision.
+    """
+    if torch.cuda.is_available() and torch.cuda.get_device_capability()[0] >= 8:
+        return "bf16-mixed"
+    return "32"
+
+
+def create_run_dir(output_dir: Path, run_id: str) -> Path:
+    """
+    Create the directory of a new run, suffixing the run ID if it is taken.
+
+    Runs started within the same second share a timestamp; creating the directory
+    exclusively keeps them from writing into each other's checkpoints and logs.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    run_dir = output_dir / run_id
+    suffix = 1
+    while True:
+        try:
+            run_dir.mkdir()
+            return run_dir
+        except FileExistsError:
+            run_dir = output_dir / f"{run_id}_{suffix}"
+            suffix += 1
+
+
 def create_callbacks(
     output_dir: Path,
     early_stopping_patience: int,
@@ -240,15 +351,39 @@ def main() -> None:
     """Main training function."""
     args = parse_args()
 
+    # CUDA graphs are captured by torch.compile's reduce-overhead mode, one per input
+    # shape; a fixed training batch size keeps it to a single training graph
+    if args.cuda_graphs:
+        if torch.cuda.is_available():
+            args.compile = True
+            args.compile_mode = "reduce-overhead"
+        else:
+            print("Warning: --cuda-graphs requires CUDA, ignoring it")
+            args.cuda_graphs = False
+
+    precision_source = "set"
+    if args.precision is None:
+        args.precision = default_precision()
+        precision_source = "auto"
+
     # Set seed for reproducibility
     pl.seed_everything(args.seed, workers=True)
 
     # Resolve paths with timestamp for unique run identification
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     data_dir = Path(args.data_dir)
-    data_file = data_dir / "merged.jsonl"
-    output_dir = Path(args.output_dir) / f"{args.experiment_name}_{timestamp}"
-    output_dir.mkdir(parents=True, exist_ok=True)
+    # Prefer the columnar dataset written by convert_data when present
+    data_file = data_dir / "merged.parquet"
+    if not data_file.exists():
+        data_file = data_dir / "merged.jsonl"
+    output_dir = create_run_dir(
+        Path(args.output_dir), f"{args.experiment_name}_{timestamp}"
+    )
+
+    # Workers send every batch as several shared tensors; sharing them through files
+    # rather than descriptors avoids running out of open file descriptors
+    if args.num_workers > 0:
+        torch.multiprocessing.set_sharing_strategy("file_system")
 
     # Initialize data module
     data_module = BloodBowlDataModule(
@@ -257,7 +392,14 @@ def main() -> None:
         val_split=args.val_split,
         test_split=args.test_split,
         num_workers=args.num_workers,
+        prefetch_factor=args.prefetch_factor,
+        pin_memory=args.pin_memory,
+        persistent_workers=args.persistent_workers,
         seed=args.seed,
+        cache_dir=args.cache_dir,
+        preparse=args.preparse,
+        streaming=args.streaming,
+        drop_last=args.cuda_graphs,
     )
 
     # Initialize model
@@ -266,7 +408,11 @@ def main() -> None:
         weight_decay=args.weight_decay,
         lr_scheduler_patience=args.lr_patience,
         lr_scheduler_factor=args.lr_factor,
+        optimizer=args.optimizer,
     )
+    if args.compile:
+        # Lightning trains the compiled module and saves the original one's weights
+        model = torch.compile(model, mode=args.compile_mode)
 
     # Create callbacks
     callbacks = create_callbacks(
@@ -313,9 +459,11 @@ def main() -> None:
         accumulate_grad_batches=args.accumulate_grad_batches,
         callbacks=callbacks,
         logger=logger,
-        deterministic=True,
+        # cuDNN ignores deterministic algorithms while benchmarking
+        deterministic=not args.benchmark,
+        benchmark=args.benchmark,
         enable_progress_bar=True,
-        log_every_n_steps=10,
+        log_every_n_steps=args.log_every_n_steps,
         val_check_interval=1.0,
         enable_model_summary=True,
     )
@@ -324,15 +472,18 @@ def main() -> None:
     print(f"\n{'=' * 60}")
     print("Blood Bowl Value Network Training")
     print(f"{'=' * 60}")
-    print(f"Run ID: {args.experiment_name}_{timestamp}")
+    print(f"Run ID: {output_dir.name}")
     print(f"Data directory: {data_dir.absolute()}")
     print(f"Output directory: {output_dir.absolute()}")
     print(f"Accelerator: {accelerator}")
-    print(f"Precision: {args.precision}")
+    print(f"Precision: {args.precision} ({precision_source})")
     if torch.cuda.is_available() and args.precision == "32":
         print(f"Float32 matmul precision: {args.matmul_precision}")
+    if args.compile:
+        print(f"torch.compile mode: {args.compile_mode}")
     print(f"Batch size: {args.batch_size}")
     print(f"Learning rate: {args.learning_rate}")
+    print(f"Optimizer: {args.optimizer}")
     print(f"Max epochs: {args.max_epochs}")
     print(f"Early stopping patience: {args.early_stopping_patience}")
     print(f"{'=' * 60}\n")
@@ -40,10 +40,10 @@ class YasaBot(Agent):
 
 
 class YasaRandom(YasaBot):
-    """Random bot with validation."""
+    """Random bot, validating the Rust actions unless `validate` is False."""
 
-    def __init__(self, name: str):
-        super().__init__(name, RandomDecisionStrategy())
+    def __init__(self, name: str, validate: bool = True):
+        super().__init__(name, RandomDecisionStrategy(validate))
 
 
 class YasaMCTS(YasaBot):
@@ -3,16 +3,55 @@ from collections.abc import Iterable
 
 from botbowl import Action, ActionType, Game, GameState, Player, Square
 
+# Plain mapping of names to action types, skipping Enum.__getitem__ on lookups
+ACTION_TYPES = ActionType.__members__
+
+# Parsed squares by (x, y). Botbowl treats squares as values, so the few hundred
+# positions on the pitch can be shared between actions instead of re-allocated
+_SQUARES: dict[tuple[int, int], Square] = {}
+
+
+def action_to_tuple(action: Action) -> tuple[str, Square | None, Player | None]:
+    """Convert an action to a readable tuple for reporting."""
+    return action.action_type.name, action.position, action.player
+
+
+def action_key(action: Action) -> tuple[int, int | None]:
+    """
+    Convert an action to a hashable key for comparison.
+
+    The action type and position are packed into one int and paired with the player
+    ID, so comparing keys never calls the Python-level hashes of squares and players.
+    """
+    key = action.action_type.value << 17
+    position = action.position
+    if position is not None:
+        key |= 1 << 16 | position.x << 8 | position.y
+    player = action.player
+    return key, None if player is None else player.player_id
+
 
 class ActionParser:
     """Handles parsing and conversion of actions."""
 
     @staticmethod
-    def parse_action(action: dict, game_state: GameState) -> Action:
+    def parse_action(
+        action: dict,
+        game_state: GameState,
+        players: dict[int, Player] | None = None,
+    ) -> Action:
+        """
+        Parse an action from JSON format to a botbowl Action object.
+
+        `players` maps the player IDs of the game state to its players. When it is
+        not given, the player is searched in the teams of the game state.
+        """
         return Action(
-            action_type=ActionType[action["action_type"]],
+            action_type=ACTION_TYPES[action["action_type"]],
             position=ActionParser._position_to_square(action.get("position")),
-            player=ActionParser._player_from_id(game_state, action.get("player")),
+            player=ActionParser._player_from_id(
+                game_state, action.get("player"), players
+            ),
         )
 
     @staticmethod
@@ -20,21 +59,49 @@ class ActionParser:
         action_data: Iterable[dict], game_state: GameState
     ) -> list[Action]:
         """Parse actions from JSON format to botbowl Action objects."""
-        return [ActionParser.parse_action(action, game_state) for action in action_data]
+        # Indexed once, so each action finds its player in constant time
+        players = ActionParser._players_by_id(game_state)
+        parse_action = ActionParser.parse_action
+        return [parse_action(action, game_state, players) for action in action_data]
 
     @staticmethod
     def _position_to_square(position: dict[str, int] | None) -> Square | None:
         """Convert position dictionary to Square object."""
         if position is None:
             return None
-        return Square(position["x"], position["y"], _out_of_bounds=False)
+        key = (position["x"], position["y"])
+        square = _SQUARES.get(key)
+        if square is None:
+            square = _SQUARES[key] = Square(key[0], key[1], _out_of_bounds=False)
+        return square
+
+    @staticmethod
+    def _players_by_id(game_state: GameState) -> dict[int, Player]:
+        """Map the player IDs of both teams to their players."""
+        return {
+            player.player_id: player
+            for team in (game_state.home_team, game_state.away_team)
+            for player in team.players
+        }
 
     @staticmethod
-    def _player_from_id(game_state: GameState, player_id: int | None) -> Player | None:
-        """Find player by ID in the game state."""
+    def _player_from_id(
+        game_state: GameState,
+        player_id: int | None,
+        players: dict[int, Player] | None = None,
+    ) -> Player | None:
+        """Find player by ID in the game state, or in its `players` index if given."""
         if player_id is None:
             return None
 
+        if players is not None:
+            player = players.get(player_id)
+            if player is None:
+                raise ValueError(
+                    f"Player with ID {player_id} not found in the game state."
+                )
+            return player
+
         for team in [game_state.home_team, game_state.away_team]:
             for player in team.players:
                 if player.player_id == player_id:
@@ -49,20 +116,25 @@ class ActionValidator:
     @staticmethod
     def extract_actions_from_game(game: Game) -> list[Action]:
         """Extract available actions from the game state."""
-        actions = []
+        actions: list[Action] = []
+        extend = actions.extend
+        place_player = ActionType.PLACE_PLAYER
         for action_choice in game.get_available_actions():
-            if action_choice.action_type == ActionType.PLACE_PLAYER:
+            action_type = action_choice.action_type
+            if action_type is place_player:
+                continue
+            players = action_choice.players
+            if players:
+                extend(
+                    Action(action_type, position=None, player=player)
+                    for player in players
+                )
                 continue
-            if len(action_choice.players) > 0:
-                for player in action_choice.players:
-                    actions.append(
-                        Action(action_choice.action_type, position=None, player=player)
-                    )
-            elif len(action_choice.positions) > 0:
-                for position in action_choice.positions:
-                    actions.append(Action(action_choice.action_type, position=position))
+            positions = action_choice.positions
+            if positions:
+                extend(Action(action_type, position=position) for position in positions)
             else:
-                actions.append(Action(action_choice.action_type))
+                actions.append(Action(action_type))
         return actions
 
     @staticmethod
@@ -71,30 +143,38 @@ class ActionValidator:
         procedure_name = game.state.stack.items[-1].__class__.__name__
         game_actions = ActionValidator.extract_actions_from_game(game)
 
-        logging.info(
-            f"Procedure: {procedure_name}, BotBowl actions: {len(game_actions)}, "
-            f"Yasa actions: {len(yasa_actions)}"
-        )
-        logging.debug(f"Game actions: {game_actions}")
-        logging.debug(f"Yasa actions: {yasa_actions}")
-
-        # Convert actions to comparable tuples
-        def action_to_tuple(action: Action) -> tuple[str, Square | None, Player | None]:
-            return action.action_type.name, action.position, action.player
+        # Only format the action lists when someone will see them
+        if logging.root.isEnabledFor(logging.INFO):
+            logging.info(
+                f"Procedure: {procedure_name}, BotBowl actions: {len(game_actions)}, "
+                f"Yasa actions: {len(yasa_actions)}"
+            )
+        if logging.root.isEnabledFor(logging.DEBUG):
+            logging.debug(f"Game actions: {game_actions}")
+            logging.debug(f"Yasa actions: {yasa_actions}")
 
-        game_action_tuples = set(action_to_tuple(a) for a in game_actions)
-        yasa_action_tuples = set(action_to_tuple(a) for a in yasa_actions)
+        # Key actions by comparable ints, keeping the actions to report differences
+        game_actions_by_key = {action_key(a): a for a in game_actions}
+        yasa_actions_by_key = {action_key(a): a for a in yasa_actions}
 
-        only_in_game = game_action_tuples - yasa_action_tuples
-        only_in_yasa = yasa_action_tuples - game_action_tuples
+        only_in_game = game_actions_by_key.keys() - yasa_actions_by_key.keys()
+        only_in_yasa = yasa_actions_by_key.keys() - game_actions_by_key.keys()
 
         # Log differences
-        for action in only_in_game:
-            logging.warning(f"Action only in game_actions: {action}")
-        for action in only_in_yasa:
-            logging.warning(f"Action only in yasa_actions: {action}")
+        for key in only_in_game:
+            logging.warning(
+                f"Action only in game_actions: "
+                f"{action_to_tuple(game_actions_by_key[key])}"
+            )
+        for key in only_in_yasa:
+            logging.warning(
+                f"Action only in yasa_actions: "
+                f"{action_to_tuple(yasa_actions_by_key[key])}"
+            )
 
         if only_in_game or only_in_yasa:
+            yasa_action_tuples = set(map(action_to_tuple, yasa_actions))
+            game_action_tuples = set(map(action_to_tuple, game_actions))
             logging.error(f"yasa_actions: {yasa_action_tuples}")
             logging.error(f"game_actions: {game_action_tuples}")
             logging.error(
@@ -1,7 +1,22 @@
+import json
+from operator import attrgetter
 from typing import Any
 
 from botbowl import BBDieResult, Dugout, GameState, Player, Team, procedure
 
+# orjson encodes the states for the Rust core several times faster; it is optional
+try:
+    import orjson
+
+    def dumps_json(obj: Any) -> bytes:
+        # Player IDs key the serialized rosters; encode them as json.dumps does
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+except ImportError:
+
+    def dumps_json(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
 PLAYER_ACTIONS = (
     procedure.MoveAction,
     procedure.PassAction,
@@ -11,43 +26,58 @@ PLAYER_ACTIONS = (
     procedure.FoulAction,
 )
 
+# Reads player IDs in C when mapped over the dugout lists
+get_player_id = attrgetter("player_id")
+
+# Procedures which carry a position or block context; all others leave them empty
+CONTEXT_PROCEDURES = (
+    procedure.Interception,
+    procedure.FollowUp,
+    procedure.Block,
+    procedure.Push,
+)
+
 
 class GameStateSerializer:
     """Handles conversion of game state to JSON format."""
 
+    @staticmethod
+    def to_bytes(game_state: GameState) -> bytes:
+        """Convert game state to the JSON bytes read by the Rust core."""
+        return dumps_json(GameStateSerializer.to_json(game_state))
+
     @staticmethod
     def to_json(game_state: GameState) -> dict[str, Any]:
         """Convert game state to JSON-serializable dictionary."""
-        basic_info = GameStateSerializer._get_basic_game_info(game_state)
-        team_info = GameStateSerializer._get_team_info(game_state)
-        procedure_info = GameStateSerializer._get_procedure_info(game_state)
-        turn_state = GameStateSerializer._get_turn_state(game_state)
+        serializer = GameStateSerializer
+        latest_turn, player_action = serializer._scan_stack(game_state)
 
-        return {
-            **basic_info,
-            **team_info,
-            **procedure_info,
-            **turn_state,
-        }
+        # The helpers fill a single dictionary instead of returning parts to merge
+        out: dict[str, Any] = {}
+        serializer._add_basic_game_info(out, game_state)
+        serializer._add_team_info(out, game_state)
+        serializer._add_procedure_info(out, game_state, player_action)
+        serializer._add_turn_state(out, latest_turn)
+        return out
 
     @staticmethod
-    def _get_basic_game_info(game_state: GameState) -> dict[str, Any]:
-        """Extract basic game information."""
-        return {
-            "half": game_state.half,
-            "round": game_state.round,
-            "game_over": game_state.game_over,
-            "weather": game_state.weather.name,
-            "balls": [
-                {
-                    "position": {"x": ball.position.x, "y": ball.position.y}
-                    if ball.position
-                    else None,
-                    "is_carried": ball.is_carried,
-                }
-                for ball in game_state.pitch.balls
-            ],
-        }
+    def _add_basic_game_info(out: dict[str, Any], game_state: GameState) -> None:
+        """Add basic game information."""
+        out["half"] = game_state.half
+        out["round"] = game_state.round
+        out["game_over"] = game_state.game_over
+        # Enum members store their name in _name_; reading it directly skips the
+        # Python-level `name` property on these per-call paths
+        out["weather"] = game_state.weather._name_
+        out["balls"] = [
+            {
+                "position": {"x": ball.position.x, "y": ball.position.y}
+                if ball.position
+                else None,
+                "is_carried": ball.is_carried,
+            }
+            for ball in game_state.pitch.balls
+        ]
 
     @staticmethod
     def _serialize_team(team: Team) -> dict[str, Any]:
@@ -60,7 +90,7 @@ class GameStateSerializer:
             players_by_id[player.player_id] = {
                 "player_id": player.player_id,
                 "role": player.role.name,
-                "skills": [skill.name for skill in player.role.skills],
+                "skills": [skill._name_ for skill in player.role.skills],
                 "ma": player.role.ma,
                 "st": player.role.st,
                 "ag": player.role.ag,
@@ -71,8 +101,11 @@ class GameStateSerializer:
                     "moves": player.state.moves,
                     "stunned": player.state.stunned,
                     "knocked_out": player.state.knocked_out,
+                    # Flat [x0, y0, x1, y1, ...] coordinates, one pair per square
                     "squares_moved": [
-                        {"x": pos.x, "y": pos.y} for pos in player.state.squares_moved
+                        coordinate
+                        for pos in player.state.squares_moved
+                        for coordinate in (pos.x, pos.y)
                     ],
                     "has_blocked": player.state.has_blocked,
                 },
@@ -93,39 +126,43 @@ class GameStateSerializer:
     def _serialize_dugout(dugout: Dugout) -> dict[str, Any]:
         return {
             "team_id": dugout.team.team_id,
-            "reserves": [player.player_id for player in dugout.reserves],
-            "kod": [player.player_id for player in dugout.kod],
-            "dungeon": [player.player_id for player in dugout.dungeon],
+            "reserves": list(map(get_player_id, dugout.reserves)),
+            "kod": list(map(get_player_id, dugout.kod)),
+            "dungeon": list(map(get_player_id, dugout.dungeon)),
         }
 
     @staticmethod
-    def _get_team_info(game_state: GameState) -> dict[str, Any]:
-        """Extract team-related information."""
-        return {
-            "home_team": GameStateSerializer._serialize_team(game_state.home_team),
-            "home_dugout": GameStateSerializer._serialize_dugout(
-                game_state.dugouts[game_state.home_team.team_id]
-            ),
-            "away_team": GameStateSerializer._serialize_team(game_state.away_team),
-            "away_dugout": GameStateSerializer._serialize_dugout(
-                game_state.dugouts[game_state.away_team.team_id]
-            ),
-            "kicking_first_half": game_state.kicking_first_half.team_id
-            if game_state.kicking_first_half is not None
-            else None,
-            "receiving_first_half": game_state.receiving_first_half.team_id
-            if game_state.receiving_first_half is not None
-            else None,
-            "kicking_this_drive": game_state.kicking_this_drive.team_id
-            if game_state.kicking_this_drive is not None
-            else None,
-            "receiving_this_drive": game_state.receiving_this_drive.team_id
-            if game_state.receiving_this_drive is not None
-            else None,
-            "coin_toss_winner": game_state.coin_toss_winner.team_id
-            if game_state.coin_toss_winner is not None
-            else None,
-        }
+    def _add_team_info(out: dict[str, Any], game_state: GameState) -> None:
+        """Add team-related information."""
+        serialize_team = GameStateSerializer._serialize_team
+        serialize_dugout = GameStateSerializer._serialize_dugout
+        home_team = game_state.home_team
+        away_team = game_state.away_team
+        dugouts = game_state.dugouts
+        kicking_first_half = game_state.kicking_first_half
+        receiving_first_half = game_state.receiving_first_half
+        kicking_this_drive = game_state.kicking_this_drive
+        receiving_this_drive = game_state.receiving_this_drive
+        coin_toss_winner = game_state.coin_toss_winner
+        out["home_team"] = serialize_team(home_team)
+        out["home_dugout"] = serialize_dugout(dugouts[home_team.team_id])
+        out["away_team"] = serialize_team(away_team)
+        out["away_dugout"] = serialize_dugout(dugouts[away_team.team_id])
+        out["kicking_first_half"] = (
+            kicking_first_half.team_id if kicking_first_half is not None else None
+        )
+        out["receiving_first_half"] = (
+            receiving_first_half.team_id if receiving_first_half is not None else None
+        )
+        out["kicking_this_drive"] = (
+            kicking_this_drive.team_id if kicking_this_drive is not None else None
+        )
+        out["receiving_this_drive"] = (
+            receiving_this_drive.team_id if receiving_this_drive is not None else None
+        )
+        out["coin_toss_winner"] = (
+            coin_toss_winner.team_id if coin_toss_winner is not None else None
+        )
 
     @staticmethod
     def _serialize_action(action) -> dict[str, Any]:
@@ -139,53 +176,59 @@ class GameStateSerializer:
         }
 
     @staticmethod
-    def _get_turn_state(game_state: GameState) -> dict[str, Any]:
-        """Extract turn state information."""
-        turn = GameStateSerializer.get_latest_turn(game_state)
+    def _add_turn_state(out: dict[str, Any], turn: procedure.Turn | None) -> None:
+        """Add turn state information from the latest turn."""
         if turn:
-            return {
-                "turn_state": {
-                    "blitz": turn.blitz,
-                    "quick_snap": turn.quick_snap,
-                    "blitz_available": turn.blitz_available,
-                    "pass_available": turn.pass_available,
-                    "foul_available": turn.foul_available,
-                    "handoff_available": turn.handoff_available,
-                }
+            out["turn_state"] = {
+                "blitz": turn.blitz,
+                "quick_snap": turn.quick_snap,
+                "blitz_available": turn.blitz_available,
+                "pass_available": turn.pass_available,
+                "foul_available": turn.foul_available,
+                "handoff_available": turn.handoff_available,
             }
-        return {"turn_state": None}
+        else:
+            out["turn_state"] = None
 
     @staticmethod
-    def _get_procedure_info(game_state: GameState) -> dict[str, Any]:
-        """Extract procedure-related information."""
-        proc = game_state.stack.items[-1] if game_state.stack.items else None
+    def _add_procedure_info(
+        out: dict[str, Any],
+        game_state: GameState,
+        player_action: procedure.Procedure | None,
+    ) -> None:
+        """Add procedure-related information."""
+        items = game_state.stack.items
+        proc = items[-1] if items else None
         proc_name = proc.__class__.__name__ if proc else None
+        current_team = game_state.current_team
+        active_player = game_state.active_player
 
         position = None
-        if isinstance(proc, procedure.Interception):
-            p = game_state.stack.items[-2].position
-            position = {"x": p.x, "y": p.y}
-        elif isinstance(proc, procedure.FollowUp):
-            position = {"x": proc.pos_to.x, "y": proc.pos_to.y}
+        block_context = None
+        # Turns and player actions, most of the states searched, skip the checks below
+        if isinstance(proc, CONTEXT_PROCEDURES):
+            if isinstance(proc, procedure.Interception):
+                p = items[-2].position
+                position = {"x": p.x, "y": p.y}
+            elif isinstance(proc, procedure.FollowUp):
+                position = {"x": proc.pos_to.x, "y": proc.pos_to.y}
+            block_context = GameStateSerializer.get_block_context(game_state, proc)
 
-        result = {
-            "procedure": proc_name,
-            "parent_procedure": GameStateSerializer.get_parent_procedure_name(
-                game_state
-            ),
-            "current_team_id": game_state.current_team.team_id
-            if game_state.current_team is not None
-            else None,
-            "active_player_id": game_state.active_player.player_id
-            if game_state.active_player is not None
-            else None,
-            "rolls": [
-                action.action_type.name for action in game_state.available_actions
-            ],
-            "position": position,
-            "block_context": GameStateSerializer.get_block_context(game_state, proc),
-        }
-        return result
+        out["procedure"] = proc_name
+        out["parent_procedure"] = (
+            player_action.__class__.__name__ if player_action is not None else None
+        )
+        out["current_team_id"] = (
+            current_team.team_id if current_team is not None else None
+        )
+        out["active_player_id"] = (
+            active_player.player_id if active_player is not None else None
+        )
+        out["rolls"] = [
+            action.action_type._name_ for action in game_state.available_actions
+        ]
+        out["position"] = position
+        out["block_context"] = block_context
 
     @staticmethod
     def get_block_context(
@@ -218,11 +261,12 @@ class GameStateSerializer:
                     "position": None,
                 }
             ]
-            i = -2
-            parent_proc = game_state.stack.items[i]
+            # Walk down the chained pushes to the block that started them
+            items = game_state.stack.items
+            i = len(items) - 2
+            parent_proc = items[i]
             while not isinstance(parent_proc, procedure.Block):
-                push_chain.insert(
-                    0,
+                push_chain.append(
                     {
                         "attacker": parent_proc.pusher.player_id,
                         "defender": parent_proc.player.player_id,
@@ -233,6 +277,9 @@ class GameStateSerializer:
                     },
                 )
                 i -= 1
+                parent_proc = items[i]
+            # The chain was collected top down; the block's own push comes first
+            push_chain.reverse()
             return {
                 "attacker": parent_proc.attacker.player_id,
                 "defender": parent_proc.defender.player_id,
@@ -245,16 +292,31 @@ class GameStateSerializer:
             }
         return None
 
+    @staticmethod
+    def _scan_stack(
+        game_state: GameState,
+    ) -> tuple[procedure.Turn | None, procedure.Procedure | None]:
+        """
+        Find the latest turn and the nearest player action on the procedure stack.
+
+        Both are found in a single pass from the top of the stack.
+        """
+        turn = None
+        player_action = None
+        for item in reversed(game_state.stack.items):
+            if player_action is None and isinstance(item, PLAYER_ACTIONS):
+                player_action = item
+            elif turn is None and isinstance(item, procedure.Turn):
+                turn = item
+            if turn is not None and player_action is not None:
+                break
+        return turn, player_action
+
     @staticmethod
     def get_latest_turn(game_state: GameState) -> procedure.Turn | None:
-        for i in range(len(game_state.stack.items) - 1, -1, -1):
-            if isinstance(game_state.stack.items[i], procedure.Turn):
-                return game_state.stack.items[i]
-        return None
+        return GameStateSerializer._scan_stack(game_state)[0]
 
     @staticmethod
     def get_parent_procedure_name(game_state: GameState) -> str | None:
-        for i in range(len(game_state.stack.items) - 1, -1, -1):
-            if isinstance(game_state.stack.items[i], PLAYER_ACTIONS):
-                return game_state.stack.items[i].__class__.__name__
-        return None
+        player_action = GameStateSerializer._scan_stack(game_state)[1]
+        return player_action.__class__.__name__ if player_action is not None else None
@@ -1,13 +1,21 @@
+import os
 from abc import ABC, abstractmethod
 
 from botbowl import Action, Game, Team
 
 from yasa.components import ActionParser, GameStateSerializer
 
+# File the strategies write the failing game state to; an empty value disables it
+ERROR_STATE_FILE = os.environ.get("YASA_ERROR_FILE", "error.json")
+
 
 class DecisionStrategy(ABC):
     """Abstract base class for decision-making strategies."""
 
+    # Strategies are consulted on every decision; slots keep their attributes
+    # at fixed offsets instead of in a per-instance dict
+    __slots__ = ("serializer", "parser")
+
     def __init__(self):
         self.serializer = GameStateSerializer()
         self.parser = ActionParser()
@@ -1,5 +1,7 @@
 import json
 import math
+from collections import deque
+from functools import lru_cache
 
 from botbowl import (
     Action,
@@ -12,7 +14,7 @@ from botbowl import (
 )
 from botbowl.core import procedure
 
-from yasa.strategies.base import DecisionStrategy
+from yasa.strategies.base import ERROR_STATE_FILE, DecisionStrategy
 from yasa.yasa_core import get_mcts_action
 
 TURN_PROCEDURES = (
@@ -30,12 +32,46 @@ TURN_PROCEDURES = (
 )
 
 
+class SubclassCache(dict):
+    """
+    Map classes to whether they subclass `bases`, computing each class on first use.
+
+    Later lookups for the same class are a plain dict lookup instead of an
+    isinstance check against every base.
+    """
+
+    def __init__(self, bases: tuple[type, ...]):
+        super().__init__()
+        self.bases = bases
+
+    def __missing__(self, cls: type) -> bool:
+        is_subclass = self[cls] = issubclass(cls, self.bases)
+        return is_subclass
+
+
+IS_TURN_PROCEDURE = SubclassCache(TURN_PROCEDURES)
+
+
+@lru_cache(maxsize=None)
+def place_ball_squares(width: int, height: int) -> tuple[Square, Square]:
+    """Return the centers of the left and right halves of an arena of this size."""
+    side_width = width / 2
+    squares_from_left = math.ceil(side_width / 2)
+    squares_from_right = math.ceil(side_width / 2)
+    squares_from_top = math.floor(height / 2)
+    left_center = Square(squares_from_left, squares_from_top)
+    right_center = Square(width - 1 - squares_from_right, squares_from_top)
+    return left_center, right_center
+
+
 class MCTSDecisionStrategy(DecisionStrategy):
     """MCTS decision strategy."""
 
+    __slots__ = ("__action_queue", "terminal", "time_limit")
+
     def __init__(self, time_limit: int = 1000, terminal: bool = False):
         super().__init__()
-        self.__action_queue: list[Action] = []
+        self.__action_queue: deque[Action] = deque()
         self.terminal = terminal
         self.time_limit = time_limit
 
@@ -47,31 +83,28 @@ class MCTSDecisionStrategy(DecisionStrategy):
         """Choose an action using the MCTS algorithm for turns and scripted for others."""
         try:
             if self.__action_queue:
-                return self.__action_queue.pop(0)
+                return self.__action_queue.popleft()
             proc = game.get_procedure()
-            if not isinstance(proc, TURN_PROCEDURES):
+            if not IS_TURN_PROCEDURE[type(proc)]:
                 return self.__choose_scripted_action(game, proc, agent_team)
             if self.__is_selecting_block(proc, agent_team):
                 return self.__select_block_dice(game.get_available_actions())
-            json_state = json.dumps(
-                self.serializer.to_json(game.state),
-            )
+            json_state = self.serializer.to_bytes(game.state)
             return self.parser.parse_action(
-                json.loads(
-                    get_mcts_action(
-                        state=json_state,
-                        time_limit=self.time_limit,
-                        terminal=self.terminal,
-                    )
-                )["action"],
+                get_mcts_action(
+                    state=json_state,
+                    time_limit=self.time_limit,
+                    terminal=self.terminal,
+                ),
                 game.state,
             )
         except Exception:
             print(
                 f"ERROR: MCTS failed to choose action for procedure {game.get_procedure()}"
             )
-            with open("error.json", "w") as f:
-                json.dump(self.serializer.to_json(game.state), f, indent=4)
+            if ERROR_STATE_FILE:
+                with open(ERROR_STATE_FILE, "w") as f:
+                    json.dump(self.serializer.to_json(game.state), f, indent=4)
             raise
 
     def __choose_scripted_action(
@@ -99,25 +132,18 @@ class MCTSDecisionStrategy(DecisionStrategy):
 
     def __setup(self, game: Game) -> Action:
         if not self.__action_queue:
-            self.__action_queue = []
             actions = [action.action_type for action in game.state.available_actions]
             if ActionType.SETUP_FORMATION_WEDGE in actions:
                 self.__action_queue.append(Action(ActionType.SETUP_FORMATION_WEDGE))
             if ActionType.SETUP_FORMATION_ZONE in actions:
                 self.__action_queue.append(Action(ActionType.SETUP_FORMATION_ZONE))
             self.__action_queue.append(Action(ActionType.END_SETUP))
-        return self.__action_queue.pop(0)
+        return self.__action_queue.popleft()
 
     @staticmethod
     def __place_ball(game: Game, agent_team: Team) -> Action:
-        side_width = game.arena.width / 2
-        side_height = game.arena.height
-        squares_from_left = math.ceil(side_width / 2)
-        squares_from_right = math.ceil(side_width / 2)
-        squares_from_top = math.floor(side_height / 2)
-        left_center = Square(squares_from_left, squares_from_top)
-        right_center = Square(
-            game.arena.width - 1 - squares_from_right, squares_from_top
+        left_center, right_center = place_ball_squares(
+            game.arena.width, game.arena.height
         )
         if game.is_team_side(left_center, game.get_opp_team(agent_team)):
             return Action(ActionType.PLACE_BALL, position=left_center)
@@ -127,8 +153,8 @@ class MCTSDecisionStrategy(DecisionStrategy):
     def __high_kick(game, agent_team: Team) -> Action:
         ball_pos = game.get_ball_position()
         if (
-            game.is_team_side(game.get_ball_position(), agent_team)
-            and game.get_player_at(game.get_ball_position()) is None
+            game.is_team_side(ball_pos, agent_team)
+            and game.get_player_at(ball_pos) is None
         ):
             for player in game.get_players_on_pitch(agent_team, up=True):
                 if (
@@ -152,21 +178,22 @@ class MCTSDecisionStrategy(DecisionStrategy):
     @staticmethod
     def __interception(game: Game, agent_team: Team) -> Action:
         ball_pos = game.get_ball_position()
-        best_dist = float("inf")
-        best_action = Action(ActionType.SELECT_NONE)
-        for avail in game.state.available_actions:
-            if avail.action_type == ActionType.SELECT_PLAYER:
-                for player in avail.players:
-                    if player.team == agent_team:
-                        dist = player.position.distance(ball_pos)
-                        if dist < best_dist:
-                            best_dist = dist
-                            best_action = Action(
-                                ActionType.SELECT_PLAYER,
-                                player=player,
-                                position=ball_pos,
-                            )
-        return best_action
+        candidates = (
+            player
+            for avail in game.state.available_actions
+            if avail.action_type is ActionType.SELECT_PLAYER
+            for player in avail.players
+            if player.team == agent_team
+        )
+        # min keeps the first of several equally close players
+        best_player = min(
+            candidates,
+            key=lambda player: player.position.distance(ball_pos),
+            default=None,
+        )
+        if best_player is None:
+            return Action(ActionType.SELECT_NONE)
+        return Action(ActionType.SELECT_PLAYER, player=best_player, position=ball_pos)
 
     @staticmethod
     def __is_selecting_block(proc: procedure.Procedure, agent_team: Team) -> bool:
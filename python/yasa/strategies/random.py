@@ -1,23 +1,28 @@
-import json
-from random import choice
+from random import Random
 
 from botbowl import Action, Game, Team
 
 from yasa.components import ActionValidator
-from yasa.strategies.base import DecisionStrategy
+from yasa.strategies.base import ERROR_STATE_FILE, DecisionStrategy
 from yasa.yasa_core import get_actions
 
 
 class RandomDecisionStrategy(DecisionStrategy):
     """Simple random decision strategy.
 
-    It gets all the possible actions using rust and validates
-    if the actions from the Rust implementation match the original ones.
+    It gets all the possible actions using rust and, when `validate` is set,
+    validates if the actions from the Rust implementation match the original ones.
+    Actions are drawn from the strategy's own generator, seeded with `seed`, so
+    games can be replayed.
     """
 
-    def __init__(self):
+    __slots__ = ("validator", "validate", "rng")
+
+    def __init__(self, validate: bool = True, seed: int | None = None):
         super().__init__()
         self.validator = ActionValidator()
+        self.validate = validate
+        self.rng = Random(seed)
 
     def choose_action(
         self,
@@ -25,17 +30,17 @@ class RandomDecisionStrategy(DecisionStrategy):
         agent_team: Team,
     ) -> Action:
         """Choose a random action from available actions."""
-        json_state = json.dumps(
-            self.serializer.to_json(game.state),
-        )
+        json_state = self.serializer.to_bytes(game.state)
         try:
             actions = self.parser.parse_actions(
-                json.loads(get_actions(json_state))["actions"],
+                get_actions(json_state),
                 game.state,
             )
-            self.validator.compare_actions(game, actions)
-            return choice(actions)
+            if self.validate:
+                self.validator.compare_actions(game, actions)
+            return actions[self.rng.randrange(len(actions))]
         except ValueError:
-            with open("error.json", "w") as f:
-                f.write(json_state)
+            if ERROR_STATE_FILE:
+                with open(ERROR_STATE_FILE, "wb") as f:
+                    f.write(json_state)
             raise
@@ -1,5 +1,5 @@
-def get_actions(state: str) -> str:
-    """Return the possible actions for the state."""
+def get_actions(state: bytes) -> list[dict]:
+    """Return the possible actions for the JSON-encoded state."""
 
-def get_mcts_action(state: str, time_limit: int, terminal: bool) -> str:
+def get_mcts_action(state: bytes, time_limit: int, terminal: bool) -> dict:
     """Return the action returned from the MCTS search"""
@@ -1,18 +1,62 @@
-use pyo3::{exceptions::PyValueError, prelude::*};
+use pyo3::{
+    exceptions::PyValueError,
+    prelude::*,
+    types::{PyBool, PyDict, PyList, PyString},
+};
+use serde::Serialize;
+use serde_json::Value;
 
 use crate::actions::core::registry::ActionRegistry;
 use crate::mcts::search::MCTSSearch;
 use crate::model::game::GameState;
-use serde_json::json;
 
 pub mod actions;
 pub mod mcts;
 pub mod model;
 pub mod pathfinding;
 
+/// Convert a JSON value into the equivalent Python object.
+fn value_to_py<'py>(py: Python<'py>, value: &Value) -> PyResult<Bound<'py, PyAny>> {
+    Ok(match value {
+        Value::Null => py.None().into_bound(py),
+        Value::Bool(b) => PyBool::new(py, *b).to_owned().into_any(),
+        Value::Number(n) => {
+            if let Some(i) = n.as_i64() {
+                i.into_pyobject(py)?.into_any()
+            } else if let Some(u) = n.as_u64() {
+                u.into_pyobject(py)?.into_any()
+            } else {
+                n.as_f64().unwrap_or(f64::NAN).into_pyobject(py)?.into_any()
+            }
+        }
+        Value::String(s) => PyString::new(py, s).into_any(),
+        Value::Array(items) => {
+            let list = PyList::empty(py);
+            for item in items {
+                list.append(value_to_py(py, item)?)?;
+            }
+            list.into_any()
+        }
+        Value::Object(map) => {
+            let dict = PyDict::new(py);
+            for (key, item) in map {
+                dict.set_item(key, value_to_py(py, item)?)?;
+            }
+            dict.into_any()
+        }
+    })
+}
+
+/// Hand a serializable result to Python as plain dicts and lists, so the caller
+/// does not have to decode a JSON string.
+fn to_py<'py, T: Serialize>(py: Python<'py>, value: &T) -> PyResult<Bound<'py, PyAny>> {
+    let value = serde_json::to_value(value).map_err(|e| PyValueError::new_err(e.to_string()))?;
+    value_to_py(py, &value)
+}
+
 #[pyfunction]
-fn get_actions(state: &str) -> PyResult<String> {
-    let game_state = GameState::from_json(state);
+fn get_actions<'py>(py: Python<'py>, state: &[u8]) -> PyResult<Bound<'py, PyAny>> {
+    let game_state = GameState::from_json_bytes(state);
     match game_state {
         Ok(mut game_state) => {
             let action_registry = ActionRegistry::new();
@@ -21,12 +65,7 @@ fn get_actions(state: &str) -> PyResult<String> {
                 Ok(_) => (),
                 Err(e) => return Err(PyValueError::new_err(e.to_string())),
             }
-            let actions = game_state.available_actions;
-            let wrapper = json!({"actions": actions});
-            match serde_json::to_string(&wrapper) {
-                Ok(s) => Ok(s),
-                Err(e) => Err(PyValueError::new_err(e.to_string())),
-            }
+            to_py(py, &game_state.available_actions)
         }
         Err(e) => Err(PyValueError::new_err(format!(
             "Invalid game state provided: {e}"
@@ -35,8 +74,13 @@ fn get_actions(state: &str) -> PyResult<String> {
 }
 
 #[pyfunction]
-fn get_mcts_action(state: &str, time_limit: u64, terminal: bool) -> PyResult<String> {
-    let game_state = GameState::from_json(state);
+fn get_mcts_action<'py>(
+    py: Python<'py>,
+    state: &[u8],
+    time_limit: u64,
+    terminal: bool,
+) -> PyResult<Bound<'py, PyAny>> {
+    let game_state = GameState::from_json_bytes(state);
     match game_state {
         Ok(game_state) => {
             let mut mcts = MCTSSearch::with_config(1.4, time_limit);
@@ -47,13 +91,7 @@ fn get_mcts_action(state: &str, time_limit: u64, terminal: bool) -> PyResult<Str
             };
 
             match result {
-                Ok(action) => {
-                    let wrapper = json!({"action": action});
-                    match serde_json::to_string(&wrapper) {
-                        Ok(s) => Ok(s),
-                        Err(e) => Err(PyValueError::new_err(e.to_string())),
-                    }
-                }
+                Ok(action) => to_py(py, &action),
                 Err(e) => Err(PyValueError::new_err(e.to_string())),
             }
         }
@@ -147,6 +147,11 @@ impl GameState {
         Ok(game_state)
     }
 
+    pub fn from_json_bytes(state: &[u8]) -> Result<GameState, serde_json::Error> {
+        let game_state: GameState = serde_json::from_slice(state)?;
+        Ok(game_state)
+    }
+
     pub fn get_current_team(&self) -> Option<&Team> {
         if let Some(current_team_id) = &self.current_team_id {
             if let Some(home_team) = &self.home_team {
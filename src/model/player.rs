@@ -1,5 +1,5 @@
 use super::enums::{PlayerRole, Skill};
-use super::position::Square;
+use super::position::{flat_squares, Square};
 use serde::{Deserialize, Serialize};
 use uuid::Uuid;
 
@@ -10,6 +10,7 @@ pub struct PlayerState {
     pub moves: u8,
     pub stunned: bool,
     pub knocked_out: bool,
+    #[serde(with = "flat_squares")]
     pub squares_moved: Vec<Square>,
     pub has_blocked: bool,
 }
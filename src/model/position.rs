@@ -124,3 +124,62 @@ impl Square {
         path
     }
 }
+
+/// (De)serializes a list of squares as a flat `[x0, y0, x1, y1, ...]` list of
+/// coordinates, which is cheaper to build on the Python side than one object per square.
+pub mod flat_squares {
+    use super::Square;
+    use serde::de::Error;
+    use serde::ser::SerializeSeq;
+    use serde::{Deserialize, Deserializer, Serializer};
+
+    pub fn serialize<S: Serializer>(squares: &[Square], serializer: S) -> Result<S::Ok, S::Error> {
+        let mut seq = serializer.serialize_seq(Some(squares.len() * 2))?;
+        for square in squares {
+            seq.serialize_element(&square.x)?;
+            seq.serialize_element(&square.y)?;
+        }
+        seq.end()
+    }
+
+    pub fn deserialize<'de, D: Deserializer<'de>>(
+        deserializer: D,
+    ) -> Result<Vec<Square>, D::Error> {
+        let coordinates = Vec::<i32>::deserialize(deserializer)?;
+        if coordinates.len() % 2 != 0 {
+            return Err(D::Error::custom(
+                "expected an even number of square coordinates",
+            ));
+        }
+        Ok(coordinates
+            .chunks_exact(2)
+            .map(|xy| Square::new(xy[0], xy[1]))
+            .collect())
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[derive(Debug, PartialEq, Serialize, Deserialize)]
+    struct Trail {
+        #[serde(with = "flat_squares")]
+        squares: Vec<Square>,
+    }
+
+    #[test]
+    fn test_flat_squares_round_trip() {
+        let trail: Trail = serde_json::from_str(r#"{"squares": [3, 4, 5, 6]}"#).unwrap();
+        assert_eq!(trail.squares, vec![Square::new(3, 4), Square::new(5, 6)]);
+        assert_eq!(
+            serde_json::to_string(&trail).unwrap(),
+            r#"{"squares":[3,4,5,6]}"#
+        );
+    }
+
+    #[test]
+    fn test_flat_squares_rejects_odd_length() {
+        assert!(serde_json::from_str::<Trail>(r#"{"squares": [3, 4, 5]}"#).is_err());
+    }
+}
@@ -3,6 +3,7 @@ mod common;
 use crate::common::AWAY_PLAYER_ID;
 use yasa_core::actions::core::registry::ActionRegistry;
 use yasa_core::model::action::Action;
+use yasa_core::model::block::PushChainItem;
 use yasa_core::model::enums::{ActionType, Procedure};
 use yasa_core::model::player::Player;
 use yasa_core::model::position::Square;
@@ -86,6 +87,22 @@ fn test_chain_push_two_players() {
     registry.execute_action(&mut state, &push_action).unwrap();
 
     assert_eq!(state.procedure, Some(Procedure::Push));
+    // The serializer's chained push context (tests/test_serializer.py) mirrors this
+    assert_eq!(
+        state.block_context.as_ref().unwrap().push_chain,
+        vec![
+            PushChainItem::new(
+                common::HOME_PLAYER_ID.to_string(),
+                AWAY_PLAYER_ID.to_string(),
+                Some(Square { x: 6, y: 7 }),
+            ),
+            PushChainItem::new(
+                AWAY_PLAYER_ID.to_string(),
+                "away_player_2".to_string(),
+                None,
+            ),
+        ]
+    );
     registry.discover_actions(&mut state).unwrap();
 
     let chain_push_action = Action::new(ActionType::Push, None, Some(Square { x: 5, y: 7 }));
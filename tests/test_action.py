@@ -0,0 +1,45 @@
+import botbowl
+
+from yasa.components.action import ActionParser
+
+
+def _game() -> botbowl.Game:
+    """Create a game with both teams in the dugout, without playing it."""
+    config = botbowl.load_config("bot-bowl")
+    config.competition_mode = False
+    ruleset = botbowl.load_rule_set(config.ruleset)
+    arena = botbowl.load_arena(config.arena)
+    home = botbowl.load_team_by_filename("human", ruleset)
+    away = botbowl.load_team_by_filename("human", ruleset)
+    return botbowl.Game(
+        "1",
+        home,
+        away,
+        botbowl.make_bot("random"),
+        botbowl.make_bot("random"),
+        config,
+        arena=arena,
+        ruleset=ruleset,
+    )
+
+
+def test_parsed_squares_are_shared():
+    square = ActionParser._position_to_square({"x": 5, "y": 7})
+
+    assert ActionParser._position_to_square({"x": 5, "y": 7}) is square
+    assert ActionParser._position_to_square({"x": 6, "y": 7}) is not square
+
+
+def test_botbowl_does_not_mutate_parsed_squares():
+    """Parsed squares are shared, so moving players on and off must not change them."""
+    game = _game()
+    square = ActionParser._position_to_square({"x": 5, "y": 7})
+    player = game.state.home_team.players[0]
+
+    game.put(player, game.get_square(4, 7))
+    game.move(player, square)
+    assert player.position == game.get_square(5, 7)
+    game.move(player, game.get_square(6, 7))
+
+    assert (square.x, square.y, square._out_of_bounds) == (5, 7, False)
+    assert ActionParser._position_to_square({"x": 5, "y": 7}) is square
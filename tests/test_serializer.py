@@ -0,0 +1,63 @@
+from types import SimpleNamespace
+
+from botbowl import BBDieResult, Square, procedure
+
+from yasa.components.serializer import GameStateSerializer
+
+HOME_PLAYER_ID = "home_player_id"
+AWAY_PLAYER_ID = "away_player_id"
+
+
+class _Block(procedure.Block):
+    def __init__(self, attacker, defender, selected_die):
+        self.attacker = attacker
+        self.defender = defender
+        self.selected_die = selected_die
+
+
+class _Push(procedure.Push):
+    def __init__(self, pusher, player, push_to=None):
+        self.pusher = pusher
+        self.player = player
+        self.push_to = push_to
+
+
+def _player(player_id: str, x: int, y: int) -> SimpleNamespace:
+    return SimpleNamespace(player_id=player_id, position=Square(x, y))
+
+
+def test_chained_push_block_context():
+    """
+    A blocks B, B is pushed into C's square: the chain matches the Rust
+    `test_chain_push_two_players` state before the chained push is resolved.
+    """
+    home = _player(HOME_PLAYER_ID, 8, 6)
+    away = _player(AWAY_PLAYER_ID, 7, 7)
+    away_2 = _player("away_player_2", 6, 7)
+    block = _Block(home, away, BBDieResult.DEFENDER_DOWN)
+    push = _Push(home, away, push_to=Square(6, 7))
+    chained_push = _Push(away, away_2)
+    game_state = SimpleNamespace(
+        stack=SimpleNamespace(items=[block, push, chained_push])
+    )
+
+    block_context = GameStateSerializer.get_block_context(game_state, chained_push)
+
+    assert block_context == {
+        "attacker": HOME_PLAYER_ID,
+        "defender": AWAY_PLAYER_ID,
+        "position": {"x": 7, "y": 7},
+        "knock_out": True,
+        "push_chain": [
+            {
+                "attacker": HOME_PLAYER_ID,
+                "defender": AWAY_PLAYER_ID,
+                "position": {"x": 6, "y": 7},
+            },
+            {
+                "attacker": AWAY_PLAYER_ID,
+                "defender": "away_player_2",
+                "position": None,
+            },
+        ],
+    }
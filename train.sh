@@ -7,7 +7,8 @@ set -euxo pipefail
 DOCKER_IMAGE="rocm/pytorch:rocm7.1_ubuntu22.04_py3.10_pytorch_release_2.8.0"
 PROJECT_ROOT=$(pwd)
 
-# Export Python deps for the container (host-side)
+# Export Python deps for the container (host-side); the rocm group includes the
+# optional training accelerators (numba, orjson, ijson, pyarrow)
 echo "INFO: Exporting Python requirements for ROCm image..."
 uv export --only-group rocm --prune torch --prune numpy --format requirements.txt > python/nn/requirements.txt
 mkdir -p artifacts